@@ -6,19 +6,88 @@ Handles weather data retrieval and forecasting.
 
 import asyncio
 import logging
-import uuid
+import os
+import random
+import time
+from string import Template
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
-from core.base_agent import BaseAgent
+from core.base_agent import BaseAgent, AgentStatus
 from core.message_bus import Message
 from core.context_manager import ContextScope
 from config.agent_config import AgentType
 
 
-class WeatherCondition(Enum):
+_WEATHER_RESPONSE = "weather_response"
+
+# Message IDs are sliced from one os.urandom() read per batch instead of
+# paying a syscall and a UUID object per message.
+_ID_BATCH_SIZE = 256
+_id_pool: List[str] = []
+
+
+def _new_id() -> str:
+    """Return a random 128-bit hex message ID."""
+    if not _id_pool:
+        raw = os.urandom(16 * _ID_BATCH_SIZE)
+        _id_pool.extend(raw[i:i + 16].hex() for i in range(0, len(raw), 16))
+    return _id_pool.pop()
+
+
+# A forked child would otherwise hand out the same IDs as its parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_id_pool.clear)
+
+
+# Current-conditions header of the weather email, parsed once at import.
+_EMAIL_HEADER = Template("""
+🌤️ WEATHER REPORT FOR ${location_upper}
+Generated on: ${current_time}
+
+📍 CURRENT WEATHER:
+==================
+Location: ${location}
+Temperature: ${temperature}°C
+Condition: ${condition_title}
+Humidity: ${humidity}%
+Wind Speed: ${wind_speed} km/h
+Wind Direction: ${wind_direction}
+Pressure: ${pressure} hPa
+Visibility: ${visibility} km
+
+📅 3-DAY FORECAST:
+==================
+""")
+
+# Per-day forecast section of the weather email.
+_DAY_TEMPLATE = """
+📅 {date}
+   High: {high_temp}°C | Low: {low_temp}°C
+   Condition: {condition_title}
+   Humidity: {humidity}%
+   Wind: {wind_speed} km/h
+   Precipitation Chance: {precipitation_chance}%
+   """ + ("─" * 40) + """
+"""
+
+# Static trailer of every weather email; only the header and per-day
+# sections depend on the request.
+_EMAIL_FOOTER = """
+
+🤖 This weather report was automatically generated by the Agentic Framework.
+🌤️ Weather data provided by Weather Agent
+📧 Email delivery handled by Email Agent
+🔄 Data sent via direct agent-to-agent communication
+
+Best regards,
+Agentic Framework Weather Bot 🌤️
+"""
+
+
+class WeatherCondition(str, Enum):
     CLEAR = "clear"
     CLOUDY = "cloudy"
     RAIN = "rain"
@@ -30,7 +99,37 @@ class WeatherCondition(Enum):
     COLD = "cold"
 
 
-@dataclass
+# Simulated climate per location name: (base temperature, possible conditions)
+_SIMULATED_CLIMATES = {
+    "New York": (15, (WeatherCondition.CLEAR, WeatherCondition.CLOUDY, WeatherCondition.RAIN)),
+    "London": (10, (WeatherCondition.CLOUDY, WeatherCondition.RAIN, WeatherCondition.FOG)),
+    "Tokyo": (20, (WeatherCondition.CLEAR, WeatherCondition.CLOUDY, WeatherCondition.RAIN)),
+}
+_DEFAULT_CLIMATE = (15, (WeatherCondition.CLEAR, WeatherCondition.CLOUDY))
+_WIND_DIRECTIONS = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+_ALERT_TYPES = ("Severe Thunderstorm", "Flood Warning", "Heat Advisory", "Winter Storm")
+_ALERT_SEVERITIES = ("Minor", "Moderate", "Severe")
+
+# Forecasts are fetched at least this many days ahead so shorter requests
+# can be served by slicing the cached result.
+_FORECAST_PREFETCH_DAYS = 14
+_FORECAST_TTL = 1800  # seconds
+# Provider condition groups (OpenWeatherMap "weather.main") mapped to WeatherCondition
+_API_CONDITIONS = {
+    "Clear": WeatherCondition.CLEAR,
+    "Clouds": WeatherCondition.CLOUDY,
+    "Rain": WeatherCondition.RAIN,
+    "Drizzle": WeatherCondition.RAIN,
+    "Thunderstorm": WeatherCondition.STORM,
+    "Snow": WeatherCondition.SNOW,
+    "Mist": WeatherCondition.FOG,
+    "Fog": WeatherCondition.FOG,
+    "Haze": WeatherCondition.FOG,
+    "Squall": WeatherCondition.WINDY,
+}
+
+
+@dataclass(frozen=True, slots=True)
 class WeatherData:
     location: str
     temperature: float
@@ -44,7 +143,7 @@ class WeatherData:
     forecast: List[Dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Location:
     location_id: str
     name: str
@@ -55,6 +154,10 @@ class Location:
     created_at: datetime = field(default_factory=datetime.now)
 
 
+class _FetchAbandoned(Exception):
+    """The task running a shared fetch was cancelled before it finished."""
+
+
 class WeatherAgent(BaseAgent):
     """
     Weather Information Agent for handling weather data and forecasts.
@@ -64,7 +167,17 @@ class WeatherAgent(BaseAgent):
         super().__init__(agent_id, config)
         self.locations: Dict[str, Location] = {}
         self.weather_cache: Dict[str, WeatherData] = {}
-        self.api_key: Optional[str] = None
+        # Pending current-weather fetches, so concurrent cache misses share one call
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # location_id -> (monotonic expiry, forecast for the longest horizon fetched)
+        self._forecast_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self.api_key: Optional[str] = config.get("api_key") or None
+        self.api_url: Optional[str] = config.get("api_url")
+        # Pooled HTTP session for the real weather API, opened in start()
+        self._http = None
+        # Bound on concurrent outbound API requests, to stay under provider rate limits
+        self._api_sem = asyncio.Semaphore(config.get("api_concurrency", 8))
+        self._rng = random.Random()
         self.logger = logging.getLogger(f"{__name__}.{self.agent_id}")
         
     async def start(self) -> bool:
@@ -73,7 +186,17 @@ class WeatherAgent(BaseAgent):
             self.logger.info("Weather agent started successfully")
             # Load API key from context
             if self.context_manager:
-                self.api_key = self.context_manager.get("weather_api_key", scope=ContextScope.GLOBAL)
+                self.api_key = self.context_manager.get("weather_api_key", scope=ContextScope.GLOBAL) or self.api_key
+            # Reuse one keep-alive connection pool for all real API calls
+            if self.api_key and self.api_url:
+                import aiohttp
+                self._http = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=64, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=60
+                    ),
+                    timeout=aiohttp.ClientTimeout(total=10),
+                    headers={"Accept-Encoding": "gzip"}
+                )
             # Initialize default locations
             await self._initialize_default_locations()
             return True
@@ -81,6 +204,9 @@ class WeatherAgent(BaseAgent):
     
     async def stop(self) -> bool:
         """Stop the weather agent."""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
         if await super().stop():
             self.logger.info("Weather agent stopped successfully")
             return True
@@ -89,28 +215,28 @@ class WeatherAgent(BaseAgent):
     async def process_message(self, message: Message) -> Optional[Message]:
         """Process incoming messages for weather operations."""
         try:
-            if message.data.get("action") == "get_current_weather":
-                return await self._handle_get_current_weather(message)
-            elif message.data.get("action") == "get_forecast":
-                return await self._handle_get_forecast(message)
-            elif message.data.get("action") == "add_location":
-                return await self._handle_add_location(message)
-            elif message.data.get("action") == "get_weather_alerts":
-                return await self._handle_get_weather_alerts(message)
-            elif message.data.get("action") == "get_weather_history":
-                return await self._handle_get_weather_history(message)
-            else:
-                return await super().process_message(message)
+            handler = self._ACTION_HANDLERS.get(message.data.get("action"))
+            if handler is not None:
+                return await getattr(self, handler)(message)
+            return await super().process_message(message)
         except Exception as e:
             self.logger.error(f"Error processing message: {e}")
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={"error": str(e)},
-                priority=message.priority
-            )
+            return self._error_reply(message, str(e))
+    
+    def _reply(self, message: Message, data: Dict[str, Any]) -> Message:
+        """Build a weather_response message addressed to the sender of ``message``."""
+        return Message(
+            id=_new_id(),
+            sender=self.agent_id,
+            recipient=message.sender,
+            type=_WEATHER_RESPONSE,
+            data=data,
+            priority=message.priority
+        )
+    
+    def _error_reply(self, message: Message, error: str) -> Message:
+        """Build an error weather_response for ``message``."""
+        return self._reply(message, {"error": error})
     
     async def _handle_get_current_weather(self, message: Message) -> Message:
         """Handle current weather request."""
@@ -118,13 +244,7 @@ class WeatherAgent(BaseAgent):
         send_to_email = message.data.get("send_to_email", False)
         
         if location_id not in self.locations:
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={"error": f"Location {location_id} not found"}
-            )
+            return self._error_reply(message, f"Location {location_id} not found")
         
         try:
             weather_data = await self._get_current_weather(location_id)
@@ -134,26 +254,14 @@ class WeatherAgent(BaseAgent):
             if send_to_email:
                 await self._send_weather_to_email_agent(weather_dict, message.data)
             
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={
-                    "action": "current_weather",
-                    "location_id": location_id,
-                    "weather": weather_dict,
-                    "sent_to_email": send_to_email
-                }
-            )
+            return self._reply(message, {
+                "action": "current_weather",
+                "location_id": location_id,
+                "weather": weather_dict,
+                "sent_to_email": send_to_email
+            })
         except Exception as e:
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={"error": f"Error getting weather: {str(e)}"}
-            )
+            return self._error_reply(message, f"Error getting weather: {str(e)}")
     
     async def _handle_get_forecast(self, message: Message) -> Message:
         """Handle weather forecast request."""
@@ -161,37 +269,19 @@ class WeatherAgent(BaseAgent):
         days = message.data.get("days", 5)
         
         if location_id not in self.locations:
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={"error": f"Location {location_id} not found"}
-            )
+            return self._error_reply(message, f"Location {location_id} not found")
         
         try:
             forecast = await self._get_weather_forecast(location_id, days)
             
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={
-                    "action": "weather_forecast",
-                    "location_id": location_id,
-                    "forecast": forecast,
-                    "days": days
-                }
-            )
+            return self._reply(message, {
+                "action": "weather_forecast",
+                "location_id": location_id,
+                "forecast": forecast,
+                "days": days
+            })
         except Exception as e:
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={"error": f"Error getting forecast: {str(e)}"}
-            )
+            return self._error_reply(message, f"Error getting forecast: {str(e)}")
     
     async def _handle_add_location(self, message: Message) -> Message:
         """Handle location addition request."""
@@ -209,61 +299,37 @@ class WeatherAgent(BaseAgent):
         self.locations[location.location_id] = location
         self.logger.info(f"Added location: {location.location_id} - {location.name}")
         
-        return Message(
-            id=str(uuid.uuid4()),
-            sender=self.agent_id,
-            recipient=message.sender,
-            type="weather_response",
-            data={
-                "action": "location_added",
+        return self._reply(message, {
+            "action": "location_added",
+            "location_id": location.location_id,
+            "location": {
                 "location_id": location.location_id,
-                "location": {
-                    "location_id": location.location_id,
-                    "name": location.name,
-                    "latitude": location.latitude,
-                    "longitude": location.longitude,
-                    "timezone": location.timezone,
-                    "country": location.country,
-                    "created_at": location.created_at.isoformat()
-                }
+                "name": location.name,
+                "latitude": location.latitude,
+                "longitude": location.longitude,
+                "timezone": location.timezone,
+                "country": location.country,
+                "created_at": location.created_at.isoformat()
             }
-        )
+        })
     
     async def _handle_get_weather_alerts(self, message: Message) -> Message:
         """Handle weather alerts request."""
         location_id = message.data.get("location_id")
         
         if location_id not in self.locations:
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={"error": f"Location {location_id} not found"}
-            )
+            return self._error_reply(message, f"Location {location_id} not found")
         
         try:
             alerts = await self._get_weather_alerts(location_id)
             
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={
-                    "action": "weather_alerts",
-                    "location_id": location_id,
-                    "alerts": alerts
-                }
-            )
+            return self._reply(message, {
+                "action": "weather_alerts",
+                "location_id": location_id,
+                "alerts": alerts
+            })
         except Exception as e:
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={"error": f"Error getting alerts: {str(e)}"}
-            )
+            return self._error_reply(message, f"Error getting alerts: {str(e)}")
     
     async def _handle_get_weather_history(self, message: Message) -> Message:
         """Handle weather history request."""
@@ -271,37 +337,30 @@ class WeatherAgent(BaseAgent):
         days_back = message.data.get("days_back", 7)
         
         if location_id not in self.locations:
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={"error": f"Location {location_id} not found"}
-            )
+            return self._error_reply(message, f"Location {location_id} not found")
         
         try:
             history = await self._get_weather_history(location_id, days_back)
             
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={
-                    "action": "weather_history",
-                    "location_id": location_id,
-                    "history": history,
-                    "days_back": days_back
-                }
-            )
+            return self._reply(message, {
+                "action": "weather_history",
+                "location_id": location_id,
+                "history": history,
+                "days_back": days_back
+            })
         except Exception as e:
-            return Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient=message.sender,
-                type="weather_response",
-                data={"error": f"Error getting history: {str(e)}"}
-            )
+            return self._error_reply(message, f"Error getting history: {str(e)}")
+    
+    # Single source of truth for action dispatch, shared by process_message
+    # and _process_message_impl; names are looked up on self so subclasses
+    # can override handlers
+    _ACTION_HANDLERS = {
+        "get_current_weather": "_handle_get_current_weather",
+        "get_forecast": "_handle_get_forecast",
+        "add_location": "_handle_add_location",
+        "get_weather_alerts": "_handle_get_weather_alerts",
+        "get_weather_history": "_handle_get_weather_history",
+    }
     
     async def _initialize_default_locations(self):
         """Initialize default weather locations."""
@@ -349,24 +408,63 @@ class WeatherAgent(BaseAgent):
             if datetime.now() - cached_data.timestamp < timedelta(minutes=30):
                 return cached_data
         
-        # Simulate weather API call
-        weather_data = await self._simulate_weather_api_call(location)
-        
-        # Cache the result
-        self.weather_cache[cache_key] = weather_data
+        # Join a fetch already in progress for this location, starting over
+        # if the task running it was cancelled
+        pending = self._inflight.get(cache_key)
+        while pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except _FetchAbandoned:
+                pending = self._inflight.get(cache_key)
         
-        return weather_data
+        pending = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = pending
+        try:
+            # Simulate weather API call
+            weather_data = await self._fetch_current_weather(location)
+            
+            # Cache the result
+            self.weather_cache[cache_key] = weather_data
+            pending.set_result(weather_data)
+            return weather_data
+        except asyncio.CancelledError:
+            # Waiters weren't cancelled themselves, so let them retry instead
+            pending.set_exception(_FetchAbandoned())
+            pending.exception()
+            raise
+        except Exception as e:
+            pending.set_exception(e)
+            # Only waiters should see the exception; don't log it as unretrieved
+            pending.exception()
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
     
     async def _get_weather_forecast(self, location_id: str, days: int) -> List[Dict[str, Any]]:
         """Get weather forecast for a location."""
         location = self.locations[location_id]
+        days = max(days, 0)
+        
+        now_monotonic = time.monotonic()
+        entry = self._forecast_cache.get(location_id)
+        if entry is not None and entry[0] > now_monotonic and len(entry[1]) >= days:
+            forecast = entry[1]
+        else:
+            forecast = self._simulate_forecast(max(days, _FORECAST_PREFETCH_DAYS))
+            
+            # Keep the cached horizon from shrinking while the existing entry is fresh
+            if entry is None or entry[0] <= now_monotonic or len(forecast) >= len(entry[1]):
+                self._forecast_cache[location_id] = (now_monotonic + _FORECAST_TTL, forecast)
         
-        # Simulate forecast API call
-        forecast = []
-        for i in range(days):
-            date = datetime.now() + timedelta(days=i)
-            forecast_day = {
-                "date": date.strftime("%Y-%m-%d"),
+        # Callers get their own day dicts so edits can't leak into the cache
+        return [dict(day) for day in forecast[:days]]
+    
+    def _simulate_forecast(self, days: int) -> List[Dict[str, Any]]:
+        """Simulate a forecast API call."""
+        now = datetime.now()
+        return [
+            {
+                "date": (now + timedelta(days=i)).strftime("%Y-%m-%d"),
                 "high_temp": 20 + (i * 2),  # Simulated temperature
                 "low_temp": 10 + (i * 1),
                 "condition": "clear",
@@ -374,9 +472,8 @@ class WeatherAgent(BaseAgent):
                 "wind_speed": 10 + (i * 2),
                 "precipitation_chance": 20 + (i * 10)
             }
-            forecast.append(forecast_day)
-        
-        return forecast
+            for i in range(days)
+        ]
     
     async def _get_weather_alerts(self, location_id: str) -> List[Dict[str, Any]]:
         """Get weather alerts for a location."""
@@ -384,17 +481,19 @@ class WeatherAgent(BaseAgent):
         alerts = []
         
         # Randomly generate some alerts
-        import random
-        if random.random() < 0.3:  # 30% chance of having alerts
-            alert_types = ["Severe Thunderstorm", "Flood Warning", "Heat Advisory", "Winter Storm"]
-            for i in range(random.randint(1, 3)):
+        rng = self._rng
+        if rng.random() < 0.3:  # 30% chance of having alerts
+            now = datetime.now()
+            start_time = now.isoformat()
+            end_time = (now + timedelta(hours=6)).isoformat()
+            for i in range(rng.randint(1, 3)):
                 alert = {
                     "alert_id": f"alert_{location_id}_{i}",
-                    "type": random.choice(alert_types),
-                    "severity": random.choice(["Minor", "Moderate", "Severe"]),
+                    "type": rng.choice(_ALERT_TYPES),
+                    "severity": rng.choice(_ALERT_SEVERITIES),
                     "description": f"Weather alert for {self.locations[location_id].name}",
-                    "start_time": datetime.now().isoformat(),
-                    "end_time": (datetime.now() + timedelta(hours=6)).isoformat()
+                    "start_time": start_time,
+                    "end_time": end_time
                 }
                 alerts.append(alert)
         
@@ -402,12 +501,10 @@ class WeatherAgent(BaseAgent):
     
     async def _get_weather_history(self, location_id: str, days_back: int) -> List[Dict[str, Any]]:
         """Get weather history for a location."""
-        history = []
-        
-        for i in range(days_back):
-            date = datetime.now() - timedelta(days=i)
-            history_day = {
-                "date": date.strftime("%Y-%m-%d"),
+        now = datetime.now()
+        return [
+            {
+                "date": (now - timedelta(days=i)).strftime("%Y-%m-%d"),
                 "high_temp": 18 + (i * 1),
                 "low_temp": 8 + (i * 1),
                 "condition": "clear",
@@ -415,40 +512,61 @@ class WeatherAgent(BaseAgent):
                 "wind_speed": 12 + (i * 1),
                 "precipitation": 0.0
             }
-            history.append(history_day)
-        
-        return history
+            for i in range(days_back)
+        ]
+    
+    async def _fetch_current_weather(self, location: Location) -> WeatherData:
+        """Fetch current weather from the configured API, or simulate it."""
+        if self._http is None:
+            return await self._simulate_weather_api_call(location)
+        payload = await self._call_weather_api({
+            "lat": location.latitude,
+            "lon": location.longitude,
+            "units": "metric"
+        })
+        return self._parse_current_weather(location, payload)
+    
+    def _parse_current_weather(self, location: Location, payload: Dict[str, Any]) -> WeatherData:
+        """Map an OpenWeatherMap current-weather payload to WeatherData."""
+        main = payload.get("main", {})
+        wind = payload.get("wind", {})
+        conditions = payload.get("weather") or [{}]
+        return WeatherData(
+            location=location.name,
+            temperature=main.get("temp", 0.0),
+            condition=_API_CONDITIONS.get(conditions[0].get("main"), WeatherCondition.CLEAR),
+            humidity=main.get("humidity", 0.0),
+            wind_speed=wind.get("speed", 0.0) * 3.6,  # m/s -> km/h
+            wind_direction=_WIND_DIRECTIONS[round(wind.get("deg", 0) / 45) % 8],
+            pressure=main.get("pressure", 0.0),
+            visibility=payload.get("visibility", 0) / 1000  # m -> km
+        )
+    
+    async def _call_weather_api(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET the weather API over the pooled HTTP session and return the JSON payload."""
+        async with self._api_sem:
+            async with self._http.get(self.api_url, params={**params, "appid": self.api_key}) as response:
+                response.raise_for_status()
+                return await response.json()
     
     async def _simulate_weather_api_call(self, location: Location) -> WeatherData:
         """Simulate a weather API call."""
         # This would normally call a real weather API
         # For now, we'll simulate the response
-        
-        import random
+        rng = self._rng
         
         # Simulate different weather conditions based on location
-        if location.name == "New York":
-            base_temp = 15
-            conditions = [WeatherCondition.CLEAR, WeatherCondition.CLOUDY, WeatherCondition.RAIN]
-        elif location.name == "London":
-            base_temp = 10
-            conditions = [WeatherCondition.CLOUDY, WeatherCondition.RAIN, WeatherCondition.FOG]
-        elif location.name == "Tokyo":
-            base_temp = 20
-            conditions = [WeatherCondition.CLEAR, WeatherCondition.CLOUDY, WeatherCondition.RAIN]
-        else:
-            base_temp = 15
-            conditions = [WeatherCondition.CLEAR, WeatherCondition.CLOUDY]
+        base_temp, conditions = _SIMULATED_CLIMATES.get(location.name, _DEFAULT_CLIMATE)
         
         weather_data = WeatherData(
             location=location.name,
-            temperature=base_temp + random.uniform(-5, 5),
-            condition=random.choice(conditions),
-            humidity=random.uniform(40, 80),
-            wind_speed=random.uniform(5, 20),
-            wind_direction=random.choice(["N", "NE", "E", "SE", "S", "SW", "W", "NW"]),
-            pressure=random.uniform(1000, 1020),
-            visibility=random.uniform(5, 15)
+            temperature=base_temp + rng.uniform(-5, 5),
+            condition=rng.choice(conditions),
+            humidity=rng.uniform(40, 80),
+            wind_speed=rng.uniform(5, 20),
+            wind_direction=rng.choice(_WIND_DIRECTIONS),
+            pressure=rng.uniform(1000, 1020),
+            visibility=rng.uniform(5, 15)
         )
         
         return weather_data
@@ -471,32 +589,54 @@ class WeatherAgent(BaseAgent):
             if isinstance(recipients, str):
                 recipients = [recipients]
             
-            email_data = {
+            base_email_data = {
                 "sender": request_data.get("email_sender"),
-                "recipients": recipients,
                 "subject": f"🌤️ Weather Report for {weather_data['location']} - {datetime.now().strftime('%Y-%m-%d')}",
                 "body": email_content,
                 "priority": "normal"
             }
             
-            # Create message to send to email agent
-            email_message = Message(
-                id=str(uuid.uuid4()),
-                sender=self.agent_id,
-                recipient="email_agent",
-                type="email_request",
-                data={"action": "compose_and_send_weather_email", "email_data": email_data}
-            )
+            # One message per recipient so the email agent can deliver them independently
+            email_messages = [
+                Message(
+                    id=_new_id(),
+                    sender=self.agent_id,
+                    recipient="email_agent",
+                    type="email_request",
+                    data={
+                        "action": "compose_and_send_weather_email",
+                        "email_data": {**base_email_data, "recipients": [recipient]}
+                    }
+                )
+                for recipient in recipients
+            ]
             
-            # Send message to email agent via message bus
-            if self.message_bus:
-                success = await self.message_bus.send_message(email_message)
-                if success:
-                    self.logger.info("✅ Weather data sent to Email Agent via message bus")
-                else:
-                    self.logger.error("❌ Failed to send weather data to Email Agent")
+            # Queue straight onto the email agent when it runs in this process,
+            # so its own processor handles them; otherwise go through the bus
+            email_agent = self.local_agents.get("email_agent")
+            if email_agent is not None and email_agent.status == AgentStatus.RUNNING:
+                sent = 0
+                for email_message in email_messages:
+                    if email_agent.enqueue_message(email_message):
+                        sent += 1
+                        if self.message_bus:
+                            self.message_bus.record_message(email_message)
+                via = "in-process"
+            elif self.message_bus:
+                results = await asyncio.gather(
+                    *(self.message_bus.send_message(m) for m in email_messages),
+                    return_exceptions=True
+                )
+                sent = sum(1 for result in results if result is True)
+                via = "message bus"
             else:
                 self.logger.error("❌ No message bus available to send data to Email Agent")
+                return
+            
+            if sent == len(email_messages):
+                self.logger.info(f"✅ Weather data sent to Email Agent via {via} ({sent} recipients)")
+            else:
+                self.logger.error(f"❌ Failed to send weather data to Email Agent for {len(email_messages) - sent} of {len(email_messages)} recipients")
                 
         except Exception as e:
             self.logger.error(f"❌ Failed to send weather data to Email Agent: {e}")
@@ -505,48 +645,19 @@ class WeatherAgent(BaseAgent):
         """Format weather data into email content."""
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        email_content = f"""
-🌤️ WEATHER REPORT FOR {weather_data['location'].upper()}
-Generated on: {current_time}
-
-📍 CURRENT WEATHER:
-==================
-Location: {weather_data['location']}
-Temperature: {weather_data['temperature']}°C
-Condition: {weather_data['condition'].title()}
-Humidity: {weather_data['humidity']}%
-Wind Speed: {weather_data['wind_speed']} km/h
-Wind Direction: {weather_data['wind_direction']}
-Pressure: {weather_data['pressure']} hPa
-Visibility: {weather_data['visibility']} km
-
-📅 3-DAY FORECAST:
-==================
-"""
+        email_content = _EMAIL_HEADER.substitute(
+            weather_data,
+            location_upper=weather_data['location'].upper(),
+            current_time=current_time,
+            condition_title=weather_data['condition'].title()
+        )
         
-        for day in forecast_data:
-            email_content += f"""
-📅 {day['date']}
-   High: {day['high_temp']}°C | Low: {day['low_temp']}°C
-   Condition: {day['condition'].title()}
-   Humidity: {day['humidity']}%
-   Wind: {day['wind_speed']} km/h
-   Precipitation Chance: {day['precipitation_chance']}%
-   {'─' * 40}
-"""
+        days_block = "".join([
+            _DAY_TEMPLATE.format(condition_title=day['condition'].title(), **day)
+            for day in forecast_data
+        ])
         
-        email_content += f"""
-
-🤖 This weather report was automatically generated by the Agentic Framework.
-🌤️ Weather data provided by Weather Agent
-📧 Email delivery handled by Email Agent
-🔄 Data sent via direct agent-to-agent communication
-
-Best regards,
-Agentic Framework Weather Bot 🌤️
-"""
-        
-        return email_content
+        return email_content + days_block + _EMAIL_FOOTER
     
     def _weather_to_dict(self, weather: WeatherData) -> Dict[str, Any]:
         """Convert weather data to dictionary for serialization."""
@@ -560,7 +671,8 @@ Agentic Framework Weather Bot 🌤️
             "pressure": weather.pressure,
             "visibility": weather.visibility,
             "timestamp": weather.timestamp.isoformat(),
-            "forecast": weather.forecast
+            # Copies, so callers can't edit the cached WeatherData's forecast
+            "forecast": [dict(day) for day in weather.forecast]
         }
 
     async def _process_message_impl(self, message: Message) -> Dict[str, Any]:
@@ -568,20 +680,14 @@ Agentic Framework Weather Bot 🌤️
         try:
             action = message.data.get("action")
             
-            if action == "get_current_weather":
-                return await self._handle_get_current_weather(message)
-            elif action == "get_forecast":
-                return await self._handle_get_forecast(message)
-            elif action == "add_location":
-                return await self._handle_add_location(message)
-            elif action == "get_weather_alerts":
-                return await self._handle_get_weather_alerts(message)
-            else:
-                return {
-                    "success": False,
-                    "error": f"Unknown action: {action}"
-                }
-                
+            handler = self._ACTION_HANDLERS.get(action)
+            if handler is not None:
+                return await getattr(self, handler)(message)
+            return {
+                "success": False,
+                "error": f"Unknown action: {action}"
+            }
+            
         except Exception as e:
             self.logger.error(f"Error in _process_message_impl: {e}")
             return {
@@ -1,4 +1,9 @@
 from fastapi import FastAPI
+from fastapi.responses import Response
+
+
+# /health is polled by liveness probes; serve a prebuilt body.
+_HEALTH_BODY = b'{"status":"ok"}'
 
 
 def create_app() -> FastAPI:
@@ -6,11 +11,9 @@ def create_app() -> FastAPI:
 
     @app.get("/health")
     async def health():
-        return {"status": "ok"}
+        return Response(content=_HEALTH_BODY, media_type="application/json")
 
     return app
 
 
 app = create_app()
-
-
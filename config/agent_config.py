@@ -2,8 +2,13 @@
 Agent Configuration - Agent-specific configuration settings
 """
 
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field
+import copy
+import pickle
+import threading
+from collections import deque
+from types import MappingProxyType
+from typing import Callable, Deque, Dict, Any, List, Mapping, Optional, Sequence, Tuple, Union
+from dataclasses import MISSING, dataclass, field, fields, replace
 from enum import Enum
 
 
@@ -20,7 +25,20 @@ class AgentType(Enum):
     CUSTOM = "custom"
 
 
-@dataclass
+_AGENT_TYPE_BY_VALUE: Dict[str, AgentType] = {t.value: t for t in AgentType}
+
+
+def parse_agent_type(value: Union[AgentType, str]) -> AgentType:
+    """Convert an agent type value (e.g. "chat") to its AgentType"""
+    if isinstance(value, AgentType):
+        return value
+    try:
+        return _AGENT_TYPE_BY_VALUE[value]
+    except KeyError:
+        raise ValueError(f"{value!r} is not a valid AgentType") from None
+
+
+@dataclass(slots=True)
 class AgentConfig:
     """Base agent configuration"""
     agent_id: str
@@ -32,448 +50,594 @@ class AgentConfig:
     max_idle_time: int = 300  # 5 minutes
     priority: int = 2  # 1=low, 2=normal, 3=high, 4=critical
     dependencies: List[str] = field(default_factory=list)
-    capabilities: List[str] = field(default_factory=list)
+    capabilities: Tuple[str, ...] = ()
     settings: Dict[str, Any] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-# Chat Agent Configuration
-CHAT_AGENT_CONFIG = AgentConfig(
-    agent_id="chat_agent",
-    agent_type=AgentType.CHAT,
-    enabled=True,
-    auto_start=True,
-    auto_restart=True,
-    max_retries=3,
-    max_idle_time=600,  # 10 minutes
-    priority=3,
-    dependencies=[],
-    capabilities=[
-        "chat",
-        "conversation",
-        "nlp",
-        "intent_recognition",
-        "context_awareness"
-    ],
-    settings={
-        "max_history_length": 50,
-        "response_timeout": 30,
-        "enable_ai": True,
-        "ai_service": "openai",
-        "default_language": "en",
-        "enable_sentiment_analysis": True,
-        "enable_entity_extraction": True,
-        "max_conversation_length": 100,
-        "enable_profanity_filter": False,
-        "enable_spam_detection": True
-    },
-    metadata={
-        "description": "Handles conversational interactions and AI-powered responses",
-        "version": "1.0.0",
-        "author": "Agentic Framework",
-        "tags": ["conversation", "ai", "nlp"]
-    }
+_AGENT_CONFIG_FIELDS = frozenset(f.name for f in fields(AgentConfig))
+# Fields holding mutable containers that a merged config must not share
+_MUTABLE_FIELDS = ("dependencies", "settings", "metadata")
+# Plain default values, used to reset pooled configs
+_FIELD_DEFAULTS = tuple(
+    (f.name, f.default) for f in fields(AgentConfig) if f.default is not MISSING
 )
 
+# Released configs available for reuse by acquire_agent_config
+_config_pool: Deque[AgentConfig] = deque(maxlen=64)
+_config_pool_lock = threading.Lock()
+
+
+# Metadata shared by every built-in agent config
+_COMMON_META = {
+    "version": "1.0.0",
+    "author": "Agentic Framework",
+}
+
+
+# Chat Agent Configuration
+def _make_chat_agent_config() -> AgentConfig:
+    return AgentConfig(
+        agent_id="chat_agent",
+        agent_type=AgentType.CHAT,
+        enabled=True,
+        auto_start=True,
+        auto_restart=True,
+        max_retries=3,
+        max_idle_time=600,  # 10 minutes
+        priority=3,
+        dependencies=[],
+        capabilities=(
+            "chat",
+            "conversation",
+            "nlp",
+            "intent_recognition",
+            "context_awareness"
+        ),
+        settings={
+            "max_history_length": 50,
+            "response_timeout": 30,
+            "enable_ai": True,
+            "ai_service": "openai",
+            "default_language": "en",
+            "enable_sentiment_analysis": True,
+            "enable_entity_extraction": True,
+            "max_conversation_length": 100,
+            "enable_profanity_filter": False,
+            "enable_spam_detection": True
+        },
+        metadata={
+            **_COMMON_META,
+            "description": "Handles conversational interactions and AI-powered responses",
+            "tags": ("conversation", "ai", "nlp")
+        }
+    )
+
 
 # Task Agent Configuration
-TASK_AGENT_CONFIG = AgentConfig(
-    agent_id="task_agent",
-    agent_type=AgentType.TASK,
-    enabled=True,
-    auto_start=True,
-    auto_restart=True,
-    max_retries=5,
-    max_idle_time=1800,  # 30 minutes
-    priority=2,
-    dependencies=[],
-    capabilities=[
-        "task_automation",
-        "workflow_execution",
-        "scheduling",
-        "file_processing",
-        "data_transformation"
-    ],
-    settings={
-        "max_concurrent_tasks": 10,
-        "task_timeout": 300,  # 5 minutes
-        "enable_parallel_execution": True,
-        "max_retry_attempts": 3,
-        "enable_task_history": True,
-        "task_history_retention_days": 30,
-        "enable_task_notifications": True,
-        "default_working_directory": "./tasks",
-        "allowed_file_types": [".txt", ".csv", ".json", ".xml", ".yaml"],
-        "max_file_size_mb": 100
-    },
-    metadata={
-        "description": "Handles task automation and workflow execution",
-        "version": "1.0.0",
-        "author": "Agentic Framework",
-        "tags": ["automation", "workflow", "tasks"]
-    }
-)
+def _make_task_agent_config() -> AgentConfig:
+    return AgentConfig(
+        agent_id="task_agent",
+        agent_type=AgentType.TASK,
+        enabled=True,
+        auto_start=True,
+        auto_restart=True,
+        max_retries=5,
+        max_idle_time=1800,  # 30 minutes
+        priority=2,
+        dependencies=[],
+        capabilities=(
+            "task_automation",
+            "workflow_execution",
+            "scheduling",
+            "file_processing",
+            "data_transformation"
+        ),
+        settings={
+            "max_concurrent_tasks": 10,
+            "task_timeout": 300,  # 5 minutes
+            "enable_parallel_execution": True,
+            "max_retry_attempts": 3,
+            "enable_task_history": True,
+            "task_history_retention_days": 30,
+            "enable_task_notifications": True,
+            "default_working_directory": "./tasks",
+            "allowed_file_types": [".txt", ".csv", ".json", ".xml", ".yaml"],
+            "max_file_size_mb": 100
+        },
+        metadata={
+            **_COMMON_META,
+            "description": "Handles task automation and workflow execution",
+            "tags": ("automation", "workflow", "tasks")
+        }
+    )
 
 
 # Email Agent Configuration
-EMAIL_AGENT_CONFIG = AgentConfig(
-    agent_id="email_agent",
-    agent_type=AgentType.EMAIL,
-    enabled=True,
-    auto_start=True,
-    auto_restart=True,
-    max_retries=3,
-    max_idle_time=900,  # 15 minutes
-    priority=2,
-    dependencies=[],
-    capabilities=[
-        "email_sending",
-        "email_receiving",
-        "email_processing",
-        "email_filtering",
-        "email_templates"
-    ],
-    settings={
-        "smtp_server": "smtp.gmail.com",
-        "smtp_port": 587,
-        "smtp_use_tls": True,
-        "imap_server": "imap.gmail.com",
-        "imap_port": 993,
-        "imap_use_ssl": True,
-        "check_interval": 300,  # 5 minutes
-        "max_emails_per_batch": 50,
-        "enable_auto_reply": False,
-        "enable_spam_filtering": True,
-        "enable_attachment_processing": True,
-        "max_attachment_size_mb": 25,
-        "email_templates_dir": "./email_templates",
-        "enable_email_analytics": True
-    },
-    metadata={
-        "description": "Handles email operations and processing",
-        "version": "1.0.0",
-        "author": "Agentic Framework",
-        "tags": ["email", "communication", "automation"]
-    }
-)
+def _make_email_agent_config() -> AgentConfig:
+    return AgentConfig(
+        agent_id="email_agent",
+        agent_type=AgentType.EMAIL,
+        enabled=True,
+        auto_start=True,
+        auto_restart=True,
+        max_retries=3,
+        max_idle_time=900,  # 15 minutes
+        priority=2,
+        dependencies=[],
+        capabilities=(
+            "email_sending",
+            "email_receiving",
+            "email_processing",
+            "email_filtering",
+            "email_templates"
+        ),
+        settings={
+            "smtp_server": "smtp.gmail.com",
+            "smtp_port": 587,
+            "smtp_use_tls": True,
+            "imap_server": "imap.gmail.com",
+            "imap_port": 993,
+            "imap_use_ssl": True,
+            "check_interval": 300,  # 5 minutes
+            "max_emails_per_batch": 50,
+            "enable_auto_reply": False,
+            "enable_spam_filtering": True,
+            "enable_attachment_processing": True,
+            "max_attachment_size_mb": 25,
+            "email_templates_dir": "./email_templates",
+            "enable_email_analytics": True
+        },
+        metadata={
+            **_COMMON_META,
+            "description": "Handles email operations and processing",
+            "tags": ("email", "communication", "automation")
+        }
+    )
 
 
 # Calendar Agent Configuration
-CALENDAR_AGENT_CONFIG = AgentConfig(
-    agent_id="calendar_agent",
-    agent_type=AgentType.CALENDAR,
-    enabled=True,
-    auto_start=True,
-    auto_restart=True,
-    max_retries=3,
-    max_idle_time=1200,  # 20 minutes
-    priority=2,
-    dependencies=[],
-    capabilities=[
-        "calendar_management",
-        "event_scheduling",
-        "meeting_coordination",
-        "reminder_management",
-        "availability_checking"
-    ],
-    settings={
-        "calendar_provider": "google",  # google, outlook, ical
-        "sync_interval": 300,  # 5 minutes
-        "default_calendar": "primary",
-        "enable_auto_scheduling": False,
-        "enable_meeting_optimization": True,
-        "default_meeting_duration": 30,  # minutes
-        "enable_reminders": True,
-        "reminder_advance_minutes": 15,
-        "enable_conflict_detection": True,
-        "enable_recurring_events": True,
-        "max_events_per_day": 20,
-        "enable_calendar_analytics": True
-    },
-    metadata={
-        "description": "Manages calendar operations and event scheduling",
-        "version": "1.0.0",
-        "author": "Agentic Framework",
-        "tags": ["calendar", "scheduling", "events"]
-    }
-)
+def _make_calendar_agent_config() -> AgentConfig:
+    return AgentConfig(
+        agent_id="calendar_agent",
+        agent_type=AgentType.CALENDAR,
+        enabled=True,
+        auto_start=True,
+        auto_restart=True,
+        max_retries=3,
+        max_idle_time=1200,  # 20 minutes
+        priority=2,
+        dependencies=[],
+        capabilities=(
+            "calendar_management",
+            "event_scheduling",
+            "meeting_coordination",
+            "reminder_management",
+            "availability_checking"
+        ),
+        settings={
+            "calendar_provider": "google",  # google, outlook, ical
+            "sync_interval": 300,  # 5 minutes
+            "default_calendar": "primary",
+            "enable_auto_scheduling": False,
+            "enable_meeting_optimization": True,
+            "default_meeting_duration": 30,  # minutes
+            "enable_reminders": True,
+            "reminder_advance_minutes": 15,
+            "enable_conflict_detection": True,
+            "enable_recurring_events": True,
+            "max_events_per_day": 20,
+            "enable_calendar_analytics": True
+        },
+        metadata={
+            **_COMMON_META,
+            "description": "Manages calendar operations and event scheduling",
+            "tags": ("calendar", "scheduling", "events")
+        }
+    )
 
 
 # Data Agent Configuration
-DATA_AGENT_CONFIG = AgentConfig(
-    agent_id="data_agent",
-    agent_type=AgentType.DATA,
-    enabled=True,
-    auto_start=True,
-    auto_restart=True,
-    max_retries=5,
-    max_idle_time=3600,  # 1 hour
-    priority=2,
-    dependencies=[],
-    capabilities=[
-        "data_analysis",
-        "data_processing",
-        "report_generation",
-        "data_visualization",
-        "statistical_analysis"
-    ],
-    settings={
-        "max_data_size_mb": 1000,
-        "enable_data_caching": True,
-        "cache_retention_hours": 24,
-        "enable_parallel_processing": True,
-        "max_parallel_jobs": 5,
-        "default_output_format": "json",
-        "enable_data_validation": True,
-        "enable_outlier_detection": True,
-        "enable_trend_analysis": True,
-        "enable_forecasting": False,
-        "max_forecast_periods": 12,
-        "enable_report_scheduling": True,
-        "default_chart_type": "line"
-    },
-    metadata={
-        "description": "Handles data analysis and processing operations",
-        "version": "1.0.0",
-        "author": "Agentic Framework",
-        "tags": ["data", "analysis", "processing"]
-    }
-)
+def _make_data_agent_config() -> AgentConfig:
+    return AgentConfig(
+        agent_id="data_agent",
+        agent_type=AgentType.DATA,
+        enabled=True,
+        auto_start=True,
+        auto_restart=True,
+        max_retries=5,
+        max_idle_time=3600,  # 1 hour
+        priority=2,
+        dependencies=[],
+        capabilities=(
+            "data_analysis",
+            "data_processing",
+            "report_generation",
+            "data_visualization",
+            "statistical_analysis"
+        ),
+        settings={
+            "max_data_size_mb": 1000,
+            "enable_data_caching": True,
+            "cache_retention_hours": 24,
+            "enable_parallel_processing": True,
+            "max_parallel_jobs": 5,
+            "default_output_format": "json",
+            "enable_data_validation": True,
+            "enable_outlier_detection": True,
+            "enable_trend_analysis": True,
+            "enable_forecasting": False,
+            "max_forecast_periods": 12,
+            "enable_report_scheduling": True,
+            "default_chart_type": "line"
+        },
+        metadata={
+            **_COMMON_META,
+            "description": "Handles data analysis and processing operations",
+            "tags": ("data", "analysis", "processing")
+        }
+    )
 
 
 # Weather Agent Configuration
-WEATHER_AGENT_CONFIG = AgentConfig(
-    agent_id="weather_agent",
-    agent_type=AgentType.WEATHER,
-    enabled=True,
-    auto_start=True,
-    auto_restart=True,
-    max_retries=3,
-    max_idle_time=1800,  # 30 minutes
-    priority=1,
-    dependencies=[],
-    capabilities=[
-        "weather_forecasting",
-        "weather_alerts",
-        "location_services",
-        "weather_history",
-        "climate_data"
-    ],
-    settings={
-        "weather_provider": "openweathermap",  # openweathermap, accuweather, weather_api
-        "api_key": "",
-        "default_location": "New York, NY",
-        "forecast_days": 7,
-        "update_interval": 1800,  # 30 minutes
-        "enable_alerts": True,
-        "alert_thresholds": {
-            "temperature_high": 35,
-            "temperature_low": -10,
-            "precipitation_probability": 80,
-            "wind_speed": 50
+def _make_weather_agent_config() -> AgentConfig:
+    return AgentConfig(
+        agent_id="weather_agent",
+        agent_type=AgentType.WEATHER,
+        enabled=True,
+        auto_start=True,
+        auto_restart=True,
+        max_retries=3,
+        max_idle_time=1800,  # 30 minutes
+        priority=1,
+        dependencies=[],
+        capabilities=(
+            "weather_forecasting",
+            "weather_alerts",
+            "location_services",
+            "weather_history",
+            "climate_data"
+        ),
+        settings={
+            "weather_provider": "openweathermap",  # openweathermap, accuweather, weather_api
+            "api_key": "",
+            "default_location": "New York, NY",
+            "forecast_days": 7,
+            "update_interval": 1800,  # 30 minutes
+            "enable_alerts": True,
+            "alert_thresholds": {
+                "temperature_high": 35,
+                "temperature_low": -10,
+                "precipitation_probability": 80,
+                "wind_speed": 50
+            },
+            "enable_location_auto_detection": True,
+            "enable_weather_history": True,
+            "history_days": 30,
+            "units": "metric"  # metric, imperial
         },
-        "enable_location_auto_detection": True,
-        "enable_weather_history": True,
-        "history_days": 30,
-        "units": "metric"  # metric, imperial
-    },
-    metadata={
-        "description": "Provides weather information and forecasting",
-        "version": "1.0.0",
-        "author": "Agentic Framework",
-        "tags": ["weather", "forecasting", "alerts"]
-    }
-)
+        metadata={
+            **_COMMON_META,
+            "description": "Provides weather information and forecasting",
+            "tags": ("weather", "forecasting", "alerts")
+        }
+    )
 
 
 # News Agent Configuration
-NEWS_AGENT_CONFIG = AgentConfig(
-    agent_id="news_agent",
-    agent_type=AgentType.NEWS,
-    enabled=True,
-    auto_start=True,
-    auto_restart=True,
-    max_retries=3,
-    max_idle_time=3600,  # 1 hour
-    priority=1,
-    dependencies=[],
-    capabilities=[
-        "news_aggregation",
-        "news_filtering",
-        "news_summarization",
-        "trend_analysis",
-        "content_curation"
-    ],
-    settings={
-        "news_sources": ["reuters", "ap", "bbc"],
-        "api_key": "",
-        "update_interval": 3600,  # 1 hour
-        "max_articles_per_fetch": 50,
-        "enable_content_filtering": True,
-        "filter_keywords": [],
-        "exclude_keywords": [],
-        "enable_sentiment_analysis": True,
-        "enable_summarization": True,
-        "summary_max_length": 200,
-        "enable_trend_detection": True,
-        "trend_window_hours": 24,
-        "enable_notifications": False,
-        "notification_keywords": []
-    },
-    metadata={
-        "description": "Aggregates and processes news content",
-        "version": "1.0.0",
-        "author": "Agentic Framework",
-        "tags": ["news", "content", "aggregation"]
-    }
-)
+def _make_news_agent_config() -> AgentConfig:
+    return AgentConfig(
+        agent_id="news_agent",
+        agent_type=AgentType.NEWS,
+        enabled=True,
+        auto_start=True,
+        auto_restart=True,
+        max_retries=3,
+        max_idle_time=3600,  # 1 hour
+        priority=1,
+        dependencies=[],
+        capabilities=(
+            "news_aggregation",
+            "news_filtering",
+            "news_summarization",
+            "trend_analysis",
+            "content_curation"
+        ),
+        settings={
+            "news_sources": ["reuters", "ap", "bbc"],
+            "api_key": "",
+            "update_interval": 3600,  # 1 hour
+            "max_articles_per_fetch": 50,
+            "enable_content_filtering": True,
+            "filter_keywords": [],
+            "exclude_keywords": [],
+            "enable_sentiment_analysis": True,
+            "enable_summarization": True,
+            "summary_max_length": 200,
+            "enable_trend_detection": True,
+            "trend_window_hours": 24,
+            "enable_notifications": False,
+            "notification_keywords": []
+        },
+        metadata={
+            **_COMMON_META,
+            "description": "Aggregates and processes news content",
+            "tags": ("news", "content", "aggregation")
+        }
+    )
 
 
 # Translation Agent Configuration
-TRANSLATION_AGENT_CONFIG = AgentConfig(
-    agent_id="translation_agent",
-    agent_type=AgentType.TRANSLATION,
-    enabled=True,
-    auto_start=True,
-    auto_restart=True,
-    max_retries=3,
-    max_idle_time=1800,  # 30 minutes
-    priority=1,
-    dependencies=[],
-    capabilities=[
-        "text_translation",
-        "language_detection",
-        "translation_memory",
-        "quality_assessment",
-        "multilingual_support"
-    ],
-    settings={
-        "translation_provider": "google",  # google, deepl, azure
-        "api_key": "",
-        "supported_languages": ["en", "es", "fr", "de", "it", "pt", "ru", "zh", "ja", "ko"],
-        "default_source_language": "auto",
-        "default_target_language": "en",
-        "enable_translation_memory": True,
-        "memory_size": 10000,
-        "enable_quality_check": True,
-        "enable_batch_translation": True,
-        "batch_size": 100,
-        "enable_glossary": False,
-        "glossary_file": "",
-        "enable_format_preservation": True,
-        "max_text_length": 5000
-    },
-    metadata={
-        "description": "Handles text translation and language processing",
-        "version": "1.0.0",
-        "author": "Agentic Framework",
-        "tags": ["translation", "language", "multilingual"]
-    }
-)
+def _make_translation_agent_config() -> AgentConfig:
+    return AgentConfig(
+        agent_id="translation_agent",
+        agent_type=AgentType.TRANSLATION,
+        enabled=True,
+        auto_start=True,
+        auto_restart=True,
+        max_retries=3,
+        max_idle_time=1800,  # 30 minutes
+        priority=1,
+        dependencies=[],
+        capabilities=(
+            "text_translation",
+            "language_detection",
+            "translation_memory",
+            "quality_assessment",
+            "multilingual_support"
+        ),
+        settings={
+            "translation_provider": "google",  # google, deepl, azure
+            "api_key": "",
+            "supported_languages": ["en", "es", "fr", "de", "it", "pt", "ru", "zh", "ja", "ko"],
+            "default_source_language": "auto",
+            "default_target_language": "en",
+            "enable_translation_memory": True,
+            "memory_size": 10000,
+            "enable_quality_check": True,
+            "enable_batch_translation": True,
+            "batch_size": 100,
+            "enable_glossary": False,
+            "glossary_file": "",
+            "enable_format_preservation": True,
+            "max_text_length": 5000
+        },
+        metadata={
+            **_COMMON_META,
+            "description": "Handles text translation and language processing",
+            "tags": ("translation", "language", "multilingual")
+        }
+    )
 
 
-# Configuration registry
-AGENT_CONFIGS = {
-    "chat_agent": CHAT_AGENT_CONFIG,
-    "task_agent": TASK_AGENT_CONFIG,
-    "email_agent": EMAIL_AGENT_CONFIG,
-    "calendar_agent": CALENDAR_AGENT_CONFIG,
-    "data_agent": DATA_AGENT_CONFIG,
-    "weather_agent": WEATHER_AGENT_CONFIG,
-    "news_agent": NEWS_AGENT_CONFIG,
-    "translation_agent": TRANSLATION_AGENT_CONFIG,
+# Built-in agents: (agent_id, agent_type, factory). The type is declared here
+# so the type index can be built without constructing any config.
+_BUILTIN_CONFIGS = (
+    ("chat_agent", AgentType.CHAT, _make_chat_agent_config),
+    ("task_agent", AgentType.TASK, _make_task_agent_config),
+    ("email_agent", AgentType.EMAIL, _make_email_agent_config),
+    ("calendar_agent", AgentType.CALENDAR, _make_calendar_agent_config),
+    ("data_agent", AgentType.DATA, _make_data_agent_config),
+    ("weather_agent", AgentType.WEATHER, _make_weather_agent_config),
+    ("news_agent", AgentType.NEWS, _make_news_agent_config),
+    ("translation_agent", AgentType.TRANSLATION, _make_translation_agent_config),
+)
+
+# Configuration registry. Built-in configs are constructed on first use;
+# _instantiated memoizes every config that has been materialized or registered.
+AGENT_CONFIGS: Dict[str, Callable[[], AgentConfig]] = {
+    agent_id: factory for agent_id, _, factory in _BUILTIN_CONFIGS
 }
+_instantiated: Dict[str, AgentConfig] = {}
+
+# Reverse index of registered agent IDs per type, so type queries only
+# materialize matching configs
+_ids_by_type: Dict[AgentType, List[str]] = {}
+for _agent_id, _agent_type, _ in _BUILTIN_CONFIGS:
+    _ids_by_type.setdefault(_agent_type, []).append(_agent_id)
+del _agent_id, _agent_type
+
+# Read-only view of every config while the registry is frozen
+_frozen_configs: Optional[Mapping[str, AgentConfig]] = None
 
 
 def get_agent_config(agent_id: str) -> Optional[AgentConfig]:
     """Get agent configuration by ID"""
-    return AGENT_CONFIGS.get(agent_id)
+    config = _instantiated.get(agent_id)
+    if config is None:
+        factory = AGENT_CONFIGS.get(agent_id)
+        if factory is None:
+            return None
+        config = _instantiated[agent_id] = factory()
+    return config
 
 
 def get_all_agent_configs() -> Dict[str, AgentConfig]:
-    """Get all agent configurations"""
-    return AGENT_CONFIGS.copy()
+    """Get all agent configurations (materializes every registered config)"""
+    if _frozen_configs is not None:
+        return dict(_frozen_configs)
+    return {agent_id: get_agent_config(agent_id) for agent_id in AGENT_CONFIGS}
 
 
 def get_agent_configs_by_type(agent_type: AgentType) -> List[AgentConfig]:
     """Get agent configurations by type"""
-    return [
-        config for config in AGENT_CONFIGS.values()
-        if config.agent_type == agent_type
-    ]
+    return [get_agent_config(agent_id) for agent_id in _ids_by_type.get(agent_type, ())]
 
 
 def get_enabled_agent_configs() -> List[AgentConfig]:
-    """Get all enabled agent configurations"""
+    """Get all enabled agent configurations (materializes every registered config)"""
     return [
-        config for config in AGENT_CONFIGS.values()
+        config for config in get_all_agent_configs().values()
         if config.enabled
     ]
 
 
 def register_agent_config(config: AgentConfig):
     """Register a new agent configuration"""
-    AGENT_CONFIGS[config.agent_id] = config
+    _check_not_frozen()
+    if not isinstance(config.capabilities, tuple):
+        config.capabilities = tuple(config.capabilities)
+    _remove_from_type_index(config.agent_id)
+    AGENT_CONFIGS[config.agent_id] = lambda: config
+    _instantiated[config.agent_id] = config
+    _ids_by_type.setdefault(config.agent_type, []).append(config.agent_id)
 
 
 def unregister_agent_config(agent_id: str):
     """Unregister an agent configuration"""
+    _check_not_frozen()
     if agent_id in AGENT_CONFIGS:
         del AGENT_CONFIGS[agent_id]
+    _instantiated.pop(agent_id, None)
+    _remove_from_type_index(agent_id)
+
+
+def freeze_registry(snapshot_path: Optional[str] = None) -> Mapping[str, AgentConfig]:
+    """
+    Materialize every config and make the registry read-only.
+    
+    Args:
+        snapshot_path: Optional file to write a pickled snapshot of the configs to
+        
+    Returns:
+        Read-only mapping of agent ID to configuration
+    """
+    global _frozen_configs
+    _frozen_configs = MappingProxyType(get_all_agent_configs())
+    if snapshot_path:
+        with open(snapshot_path, 'wb') as f:
+            pickle.dump(dict(_frozen_configs), f, protocol=pickle.HIGHEST_PROTOCOL)
+    return _frozen_configs
+
+
+def thaw_registry(snapshot_path: Optional[str] = None):
+    """
+    Make the registry writable again.
+    
+    Args:
+        snapshot_path: Optional snapshot written by freeze_registry whose configs
+            replace the current registry contents
+    """
+    global _frozen_configs
+    _frozen_configs = None
+    if snapshot_path:
+        with open(snapshot_path, 'rb') as f:
+            configs: Dict[str, AgentConfig] = pickle.load(f)
+        AGENT_CONFIGS.clear()
+        _instantiated.clear()
+        _ids_by_type.clear()
+        for config in configs.values():
+            register_agent_config(config)
+
+
+def _check_not_frozen():
+    """Raise if the registry is frozen"""
+    if _frozen_configs is not None:
+        raise RuntimeError("Agent config registry is frozen; call thaw_registry() first")
+
+
+def _remove_from_type_index(agent_id: str):
+    """Drop an agent ID from whichever type bucket holds it"""
+    for agent_ids in _ids_by_type.values():
+        if agent_id in agent_ids:
+            agent_ids.remove(agent_id)
+            return
 
 
 def create_custom_agent_config(
     agent_id: str,
-    agent_type: AgentType = AgentType.CUSTOM,
-    capabilities: Optional[List[str]] = None,
+    agent_type: Union[AgentType, str] = AgentType.CUSTOM,
+    capabilities: Optional[Sequence[str]] = None,
     settings: Optional[Dict[str, Any]] = None,
     **kwargs
 ) -> AgentConfig:
     """Create a custom agent configuration"""
     return AgentConfig(
         agent_id=agent_id,
-        agent_type=agent_type,
-        capabilities=capabilities or [],
+        agent_type=parse_agent_type(agent_type),
+        capabilities=tuple(capabilities or ()),
         settings=settings or {},
         **kwargs
     )
 
 
-def validate_agent_config(config: AgentConfig) -> List[str]:
-    """Validate agent configuration and return list of errors"""
-    errors = []
-    
-    if not config.agent_id:
-        errors.append("Agent ID is required")
-    
-    if not isinstance(config.agent_type, AgentType):
-        errors.append("Agent type must be a valid AgentType")
+def acquire_agent_config(
+    agent_id: str,
+    agent_type: Union[AgentType, str] = AgentType.CUSTOM,
+    capabilities: Optional[Sequence[str]] = None,
+    settings: Optional[Dict[str, Any]] = None,
+    **kwargs
+) -> AgentConfig:
+    """
+    Create a custom agent configuration, reusing a released one if available.
     
-    if config.max_retries < 0:
-        errors.append("Max retries must be non-negative")
+    Takes the same arguments as create_custom_agent_config. Pair with
+    release_agent_config when bulk-creating short-lived custom agents.
+    """
+    unknown = kwargs.keys() - _AGENT_CONFIG_FIELDS
+    if unknown:
+        raise TypeError(f"Unexpected agent config fields: {', '.join(sorted(unknown))}")
     
-    if config.max_idle_time < 0:
-        errors.append("Max idle time must be non-negative")
+    with _config_pool_lock:
+        config = _config_pool.pop() if _config_pool else None
+    if config is None:
+        return create_custom_agent_config(agent_id, agent_type, capabilities, settings, **kwargs)
     
-    if config.priority < 1 or config.priority > 4:
-        errors.append("Priority must be between 1 and 4")
+    # Reset to a freshly constructed state. The containers are replaced, not
+    # cleared, since they may be objects the previous caller passed in.
+    for key, default in _FIELD_DEFAULTS:
+        setattr(config, key, default)
+    config.dependencies = []
+    config.metadata = {}
     
-    return errors
+    config.agent_id = agent_id
+    config.agent_type = parse_agent_type(agent_type)
+    config.capabilities = tuple(capabilities or ())
+    config.settings = settings or {}
+    for key, value in kwargs.items():
+        setattr(config, key, value)
+    return config
+
+
+def release_agent_config(config: AgentConfig):
+    """Return a config obtained from acquire_agent_config to the pool"""
+    # Registered configs are still in use by the registry
+    if _instantiated.get(config.agent_id) is config:
+        return
+    with _config_pool_lock:
+        if len(_config_pool) < _config_pool.maxlen:
+            _config_pool.append(config)
+
+
+# (predicate, error message) pairs checked by validate_agent_config
+_CHECKS = (
+    (lambda c: bool(c.agent_id), "Agent ID is required"),
+    (lambda c: isinstance(c.agent_type, AgentType), "Agent type must be a valid AgentType"),
+    (lambda c: c.max_retries >= 0, "Max retries must be non-negative"),
+    (lambda c: c.max_idle_time >= 0, "Max idle time must be non-negative"),
+    (lambda c: 1 <= c.priority <= 4, "Priority must be between 1 and 4"),
+)
+
+
+def validate_agent_config(config: AgentConfig) -> List[str]:
+    """Validate agent configuration and return list of errors"""
+    return [message for check, message in _CHECKS if not check(config)]
 
 
 def merge_agent_configs(base_config: AgentConfig, override_config: Dict[str, Any]) -> AgentConfig:
     """Merge base configuration with override settings"""
-    import copy
-    
-    # Create a deep copy of the base config
-    merged_config = copy.deepcopy(base_config)
+    changes = {
+        key: value for key, value in override_config.items()
+        if key in _AGENT_CONFIG_FIELDS
+    }
     
-    # Update with override settings
-    for key, value in override_config.items():
-        if hasattr(merged_config, key):
-            setattr(merged_config, key, value)
+    # Only containers carried over from the base need copying; scalars,
+    # tuples and overridden values are used as-is
+    for key in _MUTABLE_FIELDS:
+        if key not in changes:
+            changes[key] = copy.deepcopy(getattr(base_config, key))
     
-    return merged_config
+    return replace(base_config, **changes)
 
 
 
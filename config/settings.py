@@ -4,15 +4,22 @@ Framework Settings - Configuration management for the agentic framework
 
 import os
 import logging
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field
+import pickle
+import secrets
+import zlib
+from typing import Callable, Dict, Any, Optional, List, Tuple
+from dataclasses import asdict, dataclass, field, is_dataclass
 from pathlib import Path
 import json
-import yaml
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
 
-@dataclass
+
+@dataclass(slots=True)
 class DatabaseConfig:
     """Database configuration settings"""
     type: str = "sqlite"  # sqlite, postgresql, mysql
@@ -38,7 +45,7 @@ class DatabaseConfig:
             raise ValueError(f"Unsupported database type: {self.type}")
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     """Logging configuration settings"""
     level: str = "INFO"
@@ -49,7 +56,7 @@ class LoggingConfig:
     console: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class APIConfig:
     """API configuration settings"""
     host: str = "0.0.0.0"
@@ -61,7 +68,7 @@ class APIConfig:
     timeout: int = 30  # seconds
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityConfig:
     """Security configuration settings"""
     secret_key: str = ""
@@ -73,7 +80,7 @@ class SecurityConfig:
     ssl_key_file: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class MonitoringConfig:
     """Monitoring configuration settings"""
     enabled: bool = True
@@ -83,7 +90,7 @@ class MonitoringConfig:
     alert_webhook: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class FrameworkConfig:
     """Main framework configuration"""
     # Core settings
@@ -138,13 +145,69 @@ class FrameworkConfig:
         self.data_dir.mkdir(exist_ok=True)
         self.logs_dir.mkdir(exist_ok=True)
         self.config_dir.mkdir(exist_ok=True)
-        
-        # Set default secret key if not provided
-        if not self.security.secret_key:
-            self.security.secret_key = os.urandom(32).hex()
-        
-        if not self.security.jwt_secret:
-            self.security.jwt_secret = os.urandom(32).hex()
+
+
+def _to_bool(value: str) -> bool:
+    return value.lower() in ('true', '1', 'yes', 'on')
+
+
+# Environment overrides: (variable, attribute path in FrameworkConfig, converter)
+_ENV_TABLE = (
+    # Core settings
+    ('FRAMEWORK_ENVIRONMENT', ('environment',), str),
+    ('FRAMEWORK_NAME', ('name',), str),
+    ('FRAMEWORK_VERSION', ('version',), str),
+    
+    # Database
+    ('DB_TYPE', ('database', 'type'), str),
+    ('DB_HOST', ('database', 'host'), str),
+    ('DB_PORT', ('database', 'port'), int),
+    ('DB_NAME', ('database', 'database'), str),
+    ('DB_USER', ('database', 'username'), str),
+    ('DB_PASSWORD', ('database', 'password'), str),
+    ('DB_URL', ('database', 'url'), str),
+    
+    # API
+    ('API_HOST', ('api', 'host'), str),
+    ('API_PORT', ('api', 'port'), int),
+    ('API_DEBUG', ('api', 'debug'), _to_bool),
+    
+    # Security
+    ('SECRET_KEY', ('security', 'secret_key'), str),
+    ('JWT_SECRET', ('security', 'jwt_secret'), str),
+    ('JWT_EXPIRATION', ('security', 'jwt_expiration'), int),
+    
+    # OpenAI
+    ('OPENAI_API_KEY', ('openai_api_key',), str),
+    ('OPENAI_MODEL', ('openai_model',), str),
+    ('OPENAI_MAX_TOKENS', ('openai_max_tokens',), int),
+    
+    # Feature flags
+    ('ENABLE_WEB_INTERFACE', ('enable_web_interface',), _to_bool),
+    ('ENABLE_API', ('enable_api',), _to_bool),
+    ('ENABLE_METRICS', ('enable_metrics',), _to_bool),
+    ('ENABLE_PERSISTENCE', ('enable_persistence',), _to_bool),
+)
+_ENV_VARS = frozenset(env_var for env_var, _, _ in _ENV_TABLE)
+
+
+def _bind_setter(path: Tuple[str, ...]) -> Callable[[Any, Any], None]:
+    """Build a setter that assigns a value at an attribute path below a root object"""
+    *parents, name = path
+    
+    def _set(root, value):
+        obj = root
+        for key in parents:
+            obj = getattr(obj, key)
+        setattr(obj, name, value)
+    
+    return _set
+
+
+# Bound once at import so environment loading is a flat loop
+_ENV_SETTERS = tuple(
+    (env_var, _bind_setter(path), convert) for env_var, path, convert in _ENV_TABLE
+)
 
 
 class Settings:
@@ -169,6 +232,13 @@ class Settings:
         # Override with environment variables
         self._load_from_environment()
         
+        # Generate secrets only if neither the file nor the environment set them
+        security = self.config.security
+        if not security.secret_key:
+            security.secret_key = secrets.token_hex(32)
+        if not security.jwt_secret:
+            security.jwt_secret = secrets.token_hex(32)
+        
         # Validate configuration
         self._validate_config()
     
@@ -177,11 +247,20 @@ class Settings:
         try:
             file_path = Path(config_file)
             if file_path.suffix.lower() == '.json':
-                with open(file_path, 'r') as f:
-                    config_data = json.load(f)
+                if orjson is not None:
+                    with open(file_path, 'rb') as f:
+                        config_data = orjson.loads(f.read())
+                else:
+                    with open(file_path, 'r') as f:
+                        config_data = json.load(f)
             elif file_path.suffix.lower() in ['.yml', '.yaml']:
+                import yaml
+                try:
+                    from yaml import CSafeLoader as Loader
+                except ImportError:
+                    from yaml import SafeLoader as Loader
                 with open(file_path, 'r') as f:
-                    config_data = yaml.safe_load(f)
+                    config_data = yaml.load(f, Loader=Loader)
             else:
                 raise ValueError(f"Unsupported config file format: {file_path.suffix}")
             
@@ -193,72 +272,14 @@ class Settings:
     
     def _load_from_environment(self):
         """Load configuration from environment variables"""
-        env_mappings = {
-            # Core settings
-            'FRAMEWORK_ENVIRONMENT': 'environment',
-            'FRAMEWORK_NAME': 'name',
-            'FRAMEWORK_VERSION': 'version',
-            
-            # Database
-            'DB_TYPE': 'database.type',
-            'DB_HOST': 'database.host',
-            'DB_PORT': 'database.port',
-            'DB_NAME': 'database.database',
-            'DB_USER': 'database.username',
-            'DB_PASSWORD': 'database.password',
-            'DB_URL': 'database.url',
-            
-            # API
-            'API_HOST': 'api.host',
-            'API_PORT': 'api.port',
-            'API_DEBUG': 'api.debug',
-            
-            # Security
-            'SECRET_KEY': 'security.secret_key',
-            'JWT_SECRET': 'security.jwt_secret',
-            'JWT_EXPIRATION': 'security.jwt_expiration',
-            
-            # OpenAI
-            'OPENAI_API_KEY': 'openai_api_key',
-            'OPENAI_MODEL': 'openai_model',
-            'OPENAI_MAX_TOKENS': 'openai_max_tokens',
-            
-            # Feature flags
-            'ENABLE_WEB_INTERFACE': 'enable_web_interface',
-            'ENABLE_API': 'enable_api',
-            'ENABLE_METRICS': 'enable_metrics',
-            'ENABLE_PERSISTENCE': 'enable_persistence',
-        }
+        if _ENV_VARS.isdisjoint(os.environ):
+            return
         
-        for env_var, config_path in env_mappings.items():
-            value = os.getenv(env_var)
+        environ = os.environ
+        for env_var, setter, convert in _ENV_SETTERS:
+            value = environ.get(env_var)
             if value is not None:
-                self._set_config_value(config_path, value)
-    
-    def _set_config_value(self, path: str, value: Any):
-        """Set a configuration value using dot notation path"""
-        keys = path.split('.')
-        obj = self.config
-        
-        for key in keys[:-1]:
-            if hasattr(obj, key):
-                obj = getattr(obj, key)
-            else:
-                return
-        
-        # Convert value type if needed
-        if hasattr(obj, keys[-1]):
-            current_value = getattr(obj, keys[-1])
-            if isinstance(current_value, bool):
-                value = value.lower() in ('true', '1', 'yes', 'on')
-            elif isinstance(current_value, int):
-                value = int(value)
-            elif isinstance(current_value, float):
-                value = float(value)
-            elif isinstance(current_value, list):
-                value = value.split(',') if isinstance(value, str) else value
-            
-            setattr(obj, keys[-1], value)
+                setter(self.config, convert(value))
     
     def _update_config_from_dict(self, config_data: Dict[str, Any]):
         """Update configuration from dictionary"""
@@ -339,32 +360,50 @@ class Settings:
     
     def save_config(self, file_path: str):
         """Save current configuration to file"""
-        config_dict = self._config_to_dict(self.config)
-        
         file_path = Path(file_path)
         if file_path.suffix.lower() == '.json':
-            with open(file_path, 'w') as f:
-                json.dump(config_dict, f, indent=2, default=str)
+            if orjson is not None:
+                # orjson serializes the dataclasses natively, no dict conversion needed
+                with open(file_path, 'wb') as f:
+                    f.write(orjson.dumps(self.config, default=str, option=orjson.OPT_INDENT_2))
+            else:
+                with open(file_path, 'w') as f:
+                    json.dump(self._config_to_dict(self.config), f, indent=2, default=str)
         elif file_path.suffix.lower() in ['.yml', '.yaml']:
+            import yaml
+            try:
+                from yaml import CSafeDumper as Dumper
+            except ImportError:
+                from yaml import SafeDumper as Dumper
+            # The safe dumper only handles plain types
+            config_dict = {
+                key: str(value) if isinstance(value, Path) else value
+                for key, value in self._config_to_dict(self.config).items()
+            }
             with open(file_path, 'w') as f:
-                yaml.dump(config_dict, f, default_flow_style=False)
+                yaml.dump(config_dict, f, Dumper=Dumper, default_flow_style=False)
         else:
             raise ValueError(f"Unsupported config file format: {file_path.suffix}")
     
     def _config_to_dict(self, config_obj) -> Dict[str, Any]:
         """Convert configuration object to dictionary"""
-        result = {}
-        for key, value in config_obj.__dict__.items():
-            if hasattr(value, '__dict__'):
-                result[key] = self._config_to_dict(value)
-            else:
-                result[key] = value
-        return result
+        if is_dataclass(config_obj):
+            return asdict(config_obj)
+        return dict(config_obj.__dict__)
     
     def reload(self):
         """Reload configuration"""
         self._load_config()
     
+    def __getstate__(self) -> bytes:
+        """Pickle as a zlib-compressed snapshot (smaller worker-process payloads)"""
+        state = (self.config_file, self.config)
+        return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 1)
+    
+    def __setstate__(self, blob: bytes):
+        """Restore from a snapshot produced by __getstate__"""
+        self.config_file, self.config = pickle.loads(zlib.decompress(blob))
+    
     def get_database_url(self) -> str:
         """Get database connection URL"""
         return self.config.database.get_connection_string()
@@ -3,8 +3,11 @@ Agent Manager - Orchestrates and manages all agents in the framework
 """
 
 import asyncio
+import itertools
 import logging
-from typing import Dict, Any, List, Optional, Type, Set
+import time
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Type, Set, Tuple
 from datetime import datetime
 import json
 import traceback
@@ -28,13 +31,21 @@ class AgentManager:
     - Performance monitoring
     """
     
-    def __init__(self, message_bus: Optional[MessageBus] = None, context_manager: Optional[ContextManager] = None):
+    def __init__(self, message_bus: Optional[MessageBus] = None, context_manager: Optional[ContextManager] = None,
+                 eager_tasks: bool = True):
         self.logger = logging.getLogger("agent_manager")
         self.agents: Dict[str, BaseAgent] = {}
         self.agent_configs: Dict[str, Dict[str, Any]] = {}
         self.agent_dependencies: Dict[str, Set[str]] = {}
+        # Reverse of agent_dependencies: agent ID -> IDs of agents depending on it
+        self.agent_dependents: Dict[str, Set[str]] = {}
         self.agent_capabilities: Dict[str, Set[str]] = {}
+        # Inverted index: capability -> IDs of agents providing it
+        self.capability_index: Dict[str, Set[str]] = defaultdict(set)
         self.agent_status: Dict[str, AgentStatus] = {}
+        # Immutable capabilities/dependencies, built once and shared by status reports
+        self._capabilities_tuple: Dict[str, Tuple[str, ...]] = {}
+        self._dependencies_tuple: Dict[str, Tuple[str, ...]] = {}
         
         # Core services
         self.message_bus = message_bus or MessageBus()
@@ -42,9 +53,29 @@ class AgentManager:
         
         # Management state
         self.is_running = False
+        self.eager_tasks = eager_tasks
+        # Loop whose task factory start() replaced, restored by stop()
+        self._factory_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._previous_task_factory = None
+        # Deliver broadcasts directly to local agents; disable when a remote
+        # transport is attached to the message bus
+        self.local_broadcast = True
         self.startup_order: List[str] = []
+        self.startup_layers: List[List[str]] = []
+        # Set when the dependency graph changes and startup_order must be re-resolved
+        self._order_dirty = True
         self.health_check_interval = 30  # seconds
         self.health_check_task: Optional[asyncio.Task] = None
+        # Long-lived per-agent health monitors, supervised by health_check_task
+        self._monitors: Dict[str, asyncio.Task] = {}
+        # Stops of unregistered agents still in flight, awaited by stop()
+        self._pending_stops: Set[asyncio.Task] = set()
+        # Bounds how many agents are checked at once
+        self._health_check_semaphore = asyncio.Semaphore(16)
+        
+        # Message IDs: random per-manager prefix plus a sequence number
+        self._message_id_prefix = f"{uuid.uuid4().int & 0xffffffff:08x}-"
+        self._message_seq = itertools.count()
         
         # Statistics
         self.total_agents = 0
@@ -52,6 +83,24 @@ class AgentManager:
         self.failed_agents = 0
         self.restart_count = 0
     
+    @staticmethod
+    def install_uvloop() -> bool:
+        """
+        Use uvloop for event loops created from now on, if it is installed.
+        
+        Must be called before the event loop is created (e.g. before asyncio.run).
+        
+        Returns:
+            bool: True if uvloop was installed
+        """
+        try:
+            import uvloop
+        except ImportError:
+            return False
+        
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        return True
+    
     async def start(self):
         """Start the agent manager and all registered agents"""
         if self.is_running:
@@ -61,16 +110,28 @@ class AgentManager:
             self.logger.info("Starting agent manager")
             self.is_running = True
             
+            # Run new tasks eagerly up to their first suspension (Python 3.12+),
+            # so sends and callbacks that finish immediately skip a loop iteration
+            if self.eager_tasks and hasattr(asyncio, "eager_task_factory"):
+                loop = asyncio.get_running_loop()
+                if loop.get_task_factory() is None:
+                    self._factory_loop = loop
+                    self._previous_task_factory = loop.get_task_factory()
+                    loop.set_task_factory(asyncio.eager_task_factory)
+            
             # Start core services
             await self.message_bus.start()
             
             # Resolve dependencies and determine startup order
-            self.startup_order = self._resolve_startup_order()
+            startup_layers = self._resolve_startup_layers()
             self.logger.info(f"Startup order: {self.startup_order}")
             
-            # Start agents in dependency order
-            for agent_id in self.startup_order:
-                await self._start_agent(agent_id)
+            # Start agents in dependency order, each layer concurrently
+            for layer in startup_layers:
+                await asyncio.gather(
+                    *(self._start_agent(agent_id) for agent_id in layer),
+                    return_exceptions=True
+                )
             
             # Start health monitoring
             self.health_check_task = asyncio.create_task(self._health_monitor())
@@ -98,14 +159,29 @@ class AgentManager:
                     await self.health_check_task
                 except asyncio.CancelledError:
                     pass
+            for agent_id in list(self._monitors):
+                self._cancel_monitor(agent_id)
             
-            # Stop all agents in reverse startup order
-            for agent_id in reversed(self.startup_order):
-                await self._stop_agent(agent_id)
+            # Stop all agents in reverse startup order, each layer concurrently
+            for layer in reversed(self.startup_layers):
+                await asyncio.gather(
+                    *(self._stop_agent(agent_id) for agent_id in layer),
+                    return_exceptions=True
+                )
+            
+            # Let stops of unregistered agents finish
+            if self._pending_stops:
+                await asyncio.gather(*self._pending_stops, return_exceptions=True)
             
             # Stop core services
             await self.message_bus.stop()
             
+            # Hand the loop back with the task factory it had before start()
+            if self._factory_loop is not None:
+                self._factory_loop.set_task_factory(self._previous_task_factory)
+                self._factory_loop = None
+                self._previous_task_factory = None
+            
             self.logger.info("Agent manager stopped successfully")
             
         except Exception as e:
@@ -123,6 +199,7 @@ class AgentManager:
         
         if agent_id in self.agents:
             self.logger.warning(f"Agent {agent_id} already registered, replacing")
+            self._unindex_agent(agent_id)
         
         # Store agent and configuration
         self.agents[agent_id] = agent
@@ -130,10 +207,18 @@ class AgentManager:
         self.agent_dependencies[agent_id] = set(agent.dependencies)
         self.agent_capabilities[agent_id] = set(agent.capabilities)
         self.agent_status[agent_id] = AgentStatus.STOPPED
+        self._capabilities_tuple[agent_id] = tuple(self.agent_capabilities[agent_id])
+        self._dependencies_tuple[agent_id] = tuple(self.agent_dependencies[agent_id])
+        for dep_id in self.agent_dependencies[agent_id]:
+            self.agent_dependents.setdefault(dep_id, set()).add(agent_id)
+        for capability in self.agent_capabilities[agent_id]:
+            self.capability_index[capability].add(agent_id)
+        self._order_dirty = True
         
         # Set up agent with manager services
         agent.message_bus = self.message_bus
         agent.context_manager = self.context_manager
+        agent.local_agents = self.agents
         
         # Set up callbacks
         agent.set_status_change_callback(
@@ -141,7 +226,7 @@ class AgentManager:
         )
         
         self.total_agents += 1
-        self.logger.info(f"Registered agent: {agent_id} with capabilities: {agent.capabilities}")
+        self.logger.info("Registered agent: %s with capabilities: %s", agent_id, agent.capabilities)
     
     def unregister_agent(self, agent_id: str):
         """
@@ -154,22 +239,34 @@ class AgentManager:
             self.logger.warning(f"Agent {agent_id} not found for unregistration")
             return
         
-        # Stop the agent if running
-        asyncio.create_task(self._stop_agent(agent_id))
-        
-        # Remove from tracking
-        del self.agents[agent_id]
+        # Stop the agent if running; the task holds its own reference to the agent
+        self._cancel_monitor(agent_id)
+        agent = self.agents.pop(agent_id)
+        stop_task = asyncio.create_task(agent.stop())
+        self._pending_stops.add(stop_task)
+        stop_task.add_done_callback(self._pending_stops.discard)
+        
+        # Remove from tracking; later status changes of the agent are ignored,
+        # so account for it as stopped now
+        self._on_agent_status_change(agent_id, self.agent_status[agent_id], AgentStatus.STOPPED)
+        self._unindex_agent(agent_id)
         del self.agent_configs[agent_id]
         del self.agent_dependencies[agent_id]
         del self.agent_capabilities[agent_id]
         del self.agent_status[agent_id]
+        del self._capabilities_tuple[agent_id]
+        del self._dependencies_tuple[agent_id]
         
-        # Update startup order
+        # Update startup order (dropping an agent keeps the remaining order valid)
         if agent_id in self.startup_order:
             self.startup_order.remove(agent_id)
+            for layer in self.startup_layers:
+                if agent_id in layer:
+                    layer.remove(agent_id)
+                    break
         
         self.total_agents -= 1
-        self.logger.info(f"Unregistered agent: {agent_id}")
+        self.logger.info("Unregistered agent: %s", agent_id)
     
     async def start_agent(self, agent_id: str) -> bool:
         """
@@ -217,13 +314,13 @@ class AgentManager:
             self.logger.error(f"Agent {agent_id} not found")
             return False
         
-        self.logger.info(f"Restarting agent {agent_id}")
+        self.logger.info("Restarting agent %s", agent_id)
         
         # Stop the agent
         await self._stop_agent(agent_id)
         
-        # Wait a moment
-        await asyncio.sleep(1)
+        # Optional cool-down between stop and start; by default just yield once
+        await asyncio.sleep(self.agent_configs[agent_id].get("restart_cooldown", 0))
         
         # Start the agent
         success = await self._start_agent(agent_id)
@@ -243,10 +340,7 @@ class AgentManager:
     
     def get_agents_by_capability(self, capability: str) -> List[str]:
         """Get all agents that have a specific capability"""
-        return [
-            agent_id for agent_id, capabilities in self.agent_capabilities.items()
-            if capability in capabilities
-        ]
+        return list(self.capability_index.get(capability, ()))
     
     def get_agent_dependencies(self, agent_id: str) -> Set[str]:
         """Get the dependencies of an agent"""
@@ -254,11 +348,7 @@ class AgentManager:
     
     def get_agent_dependents(self, agent_id: str) -> Set[str]:
         """Get agents that depend on this agent"""
-        dependents = set()
-        for dep_agent_id, dependencies in self.agent_dependencies.items():
-            if agent_id in dependencies:
-                dependents.add(dep_agent_id)
-        return dependents
+        return self.agent_dependents.get(agent_id, set()).copy()
     
     async def send_message_to_agent(self, target_agent: str, message_type: str, 
                                    data: Dict[str, Any], sender: str = "system") -> bool:
@@ -279,7 +369,7 @@ class AgentManager:
             return False
         
         message = Message(
-            id=str(uuid.uuid4()),
+            id=self._next_message_id(),
             sender=sender,
             recipient=target_agent,
             type=message_type,
@@ -303,7 +393,7 @@ class AgentManager:
             bool: True if message broadcast successfully
         """
         message = Message(
-            id=str(uuid.uuid4()),
+            id=self._next_message_id(),
             sender=sender,
             recipient="*",
             type=message_type,
@@ -311,14 +401,35 @@ class AgentManager:
             timestamp=datetime.now()
         )
         
+        # When every broadcast subscriber is one of our running agents with
+        # nothing waiting on the bus, hand the message straight to their queues.
+        # Otherwise go through the bus so the broadcast stays behind earlier
+        # messages and skips stopped agents.
+        subscribers = self.message_bus.broadcast_subscribers
+        if self.local_broadcast and subscribers <= self.agents.keys() and all(
+            self._can_deliver_locally(agent_id) for agent_id in subscribers
+        ):
+            delivered = sum(self.agents[agent_id].enqueue_message(message) for agent_id in subscribers)
+            self.message_bus.record_broadcast(message, delivered)
+            return bool(delivered)
+        
         return await self.message_bus.broadcast_message(message)
     
+    def _can_deliver_locally(self, agent_id: str) -> bool:
+        """Check that an agent is running and has no messages waiting on the bus"""
+        if self.agents[agent_id].status != AgentStatus.RUNNING:
+            return False
+        bus_queue = self.message_bus.message_queues.get(agent_id)
+        return bus_queue is None or bus_queue.empty()
+    
+    def _next_message_id(self) -> str:
+        """Generate a unique ID for a message sent by the manager"""
+        return f"{self._message_id_prefix}{next(self._message_seq):x}"
+    
     def get_framework_status(self) -> Dict[str, Any]:
         """Get overall framework status"""
-        running_count = sum(1 for status in self.agent_status.values() 
-                           if status == AgentStatus.RUNNING)
-        error_count = sum(1 for status in self.agent_status.values() 
-                         if status == AgentStatus.ERROR)
+        running_count = self.running_agents
+        error_count = self.failed_agents
         
         return {
             "manager_status": "running" if self.is_running else "stopped",
@@ -331,46 +442,80 @@ class AgentManager:
             "agents": {
                 agent_id: {
                     "status": status.value,
-                    "capabilities": list(self.agent_capabilities[agent_id]),
-                    "dependencies": list(self.agent_dependencies[agent_id])
+                    "capabilities": self._capabilities_tuple[agent_id],
+                    "dependencies": self._dependencies_tuple[agent_id]
                 }
                 for agent_id, status in self.agent_status.items()
             }
         }
     
+    def _unindex_agent(self, agent_id: str):
+        """Remove an agent's entries from the reverse indexes"""
+        for dep_id in self.agent_dependencies.get(agent_id, ()):
+            dependents = self.agent_dependents.get(dep_id)
+            if dependents is not None:
+                dependents.discard(agent_id)
+                if not dependents:
+                    del self.agent_dependents[dep_id]
+        for capability in self.agent_capabilities.get(agent_id, ()):
+            providers = self.capability_index.get(capability)
+            if providers is not None:
+                providers.discard(agent_id)
+                if not providers:
+                    del self.capability_index[capability]
+    
     def _resolve_startup_order(self) -> List[str]:
         """
         Resolve the startup order based on dependencies.
         Uses topological sorting to ensure dependencies are started first.
+        The result is cached until an agent is registered.
         """
-        # Create a copy of dependencies for processing
-        dependencies = {agent_id: deps.copy() for agent_id, deps in self.agent_dependencies.items()}
-        
-        # Find agents with no dependencies
-        ready_agents = [agent_id for agent_id, deps in dependencies.items() if not deps]
-        startup_order = []
-        
-        while ready_agents:
-            # Take the first ready agent
-            agent_id = ready_agents.pop(0)
-            startup_order.append(agent_id)
-            
-            # Remove this agent from all dependency lists
-            for other_agent_id, deps in dependencies.items():
-                if agent_id in deps:
-                    deps.remove(agent_id)
-                    # If this agent now has no dependencies, add it to ready list
-                    if not deps and other_agent_id not in startup_order:
-                        ready_agents.append(other_agent_id)
+        self._resolve_startup_layers()
+        return self.startup_order
+    
+    def _resolve_startup_layers(self) -> List[List[str]]:
+        """
+        Group the startup order into layers of mutually independent agents.
+        Every agent's dependencies are in earlier layers, so each layer can be
+        started concurrently once the previous one is up.
+        """
+        if not self._order_dirty:
+            return self.startup_layers
+        
+        # Kahn's algorithm: count unmet dependencies and index who depends on whom
+        indegree = {agent_id: len(deps) for agent_id, deps in self.agent_dependencies.items()}
+        dependents: Dict[str, List[str]] = {}
+        for agent_id, deps in self.agent_dependencies.items():
+            for dep_id in deps:
+                dependents.setdefault(dep_id, []).append(agent_id)
+        
+        layer = [agent_id for agent_id, count in indegree.items() if count == 0]
+        layers = []
+        
+        while layer:
+            layers.append(layer)
+            next_layer = []
+            for agent_id in layer:
+                for dependent_id in dependents.get(agent_id, ()):
+                    indegree[dependent_id] -= 1
+                    if indegree[dependent_id] == 0:
+                        next_layer.append(dependent_id)
+            layer = next_layer
+        
+        startup_order = [agent_id for layer in layers for agent_id in layer]
         
         # Check for circular dependencies
         if len(startup_order) != len(self.agents):
             remaining = set(self.agents.keys()) - set(startup_order)
             self.logger.error(f"Circular dependency detected. Remaining agents: {remaining}")
             # Add remaining agents at the end (they may fail to start)
-            startup_order.extend(list(remaining))
+            layers.append(list(remaining))
+            startup_order.extend(layers[-1])
         
-        return startup_order
+        self.startup_layers = layers
+        self.startup_order = startup_order
+        self._order_dirty = False
+        return layers
     
     async def _start_agent(self, agent_id: str) -> bool:
         """Start a specific agent"""
@@ -380,7 +525,7 @@ class AgentManager:
             
             # Check if agent should auto-start
             if not config.get("auto_start", True):
-                self.logger.info(f"Agent {agent_id} auto-start disabled")
+                self.logger.info("Agent %s auto-start disabled", agent_id)
                 return True
             
             # Check dependencies
@@ -395,38 +540,31 @@ class AgentManager:
                     return False
             
             # Start the agent
+            # Status and counters are updated by _on_agent_status_change
             success = await agent.start()
             if success:
-                self.agent_status[agent_id] = AgentStatus.RUNNING
-                self.running_agents += 1
-                self.logger.info(f"Agent {agent_id} started successfully")
+                self.logger.info("Agent %s started successfully", agent_id)
             else:
-                self.agent_status[agent_id] = AgentStatus.ERROR
-                self.failed_agents += 1
                 self.logger.error(f"Failed to start agent {agent_id}")
             
+            # Monitor the agent either way, so a failed start gets retried
+            self._ensure_monitor(agent_id)
             return success
             
         except Exception as e:
             self.logger.error(f"Error starting agent {agent_id}: {e}")
-            self.agent_status[agent_id] = AgentStatus.ERROR
-            self.failed_agents += 1
             return False
     
     async def _stop_agent(self, agent_id: str) -> bool:
         """Stop a specific agent"""
         try:
             agent = self.agents[agent_id]
+            self._cancel_monitor(agent_id)
             
             # Stop the agent
             success = await agent.stop()
             if success:
-                self.agent_status[agent_id] = AgentStatus.STOPPED
-                if self.agent_status[agent_id] == AgentStatus.RUNNING:
-                    self.running_agents -= 1
-                elif self.agent_status[agent_id] == AgentStatus.ERROR:
-                    self.failed_agents -= 1
-                self.logger.info(f"Agent {agent_id} stopped successfully")
+                self.logger.info("Agent %s stopped successfully", agent_id)
             else:
                 self.logger.error(f"Failed to stop agent {agent_id}")
             
@@ -437,7 +575,9 @@ class AgentManager:
             return False
     
     def _on_agent_status_change(self, agent_id: str, old_status: AgentStatus, new_status: AgentStatus):
-        """Handle agent status changes"""
+        """Handle agent status changes. The only place agent status counters are updated."""
+        if agent_id not in self.agent_status:
+            return
         self.agent_status[agent_id] = new_status
         
         # Update counters
@@ -451,42 +591,97 @@ class AgentManager:
         elif old_status != AgentStatus.ERROR and new_status == AgentStatus.ERROR:
             self.failed_agents += 1
         
-        self.logger.info(f"Agent {agent_id} status changed: {old_status.value} -> {new_status.value}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Agent %s status changed: %s -> %s", agent_id, old_status.value, new_status.value)
     
     async def _health_monitor(self):
-        """Monitor agent health and restart failed agents"""
+        """Supervise the per-agent monitors and restart any that crashed"""
         while self.is_running:
             try:
                 await asyncio.sleep(self.health_check_interval)
                 
-                # Check each agent's health
-                for agent_id, agent in self.agents.items():
-                    config = self.agent_configs[agent_id]
-                    
-                    # Skip if auto-restart is disabled
-                    if not config.get("auto_restart", True):
-                        continue
-                    
-                    # Check if agent is in error state
-                    if self.agent_status[agent_id] == AgentStatus.ERROR:
-                        self.logger.warning(f"Agent {agent_id} is in error state, attempting restart")
-                        await self.restart_agent(agent_id)
-                    
-                    # Check if agent has been running for too long without activity
-                    health = agent.get_health()
-                    if health.get("last_activity"):
-                        last_activity = datetime.fromisoformat(health["last_activity"])
-                        max_idle_time = config.get("max_idle_time", 300)  # 5 minutes default
-                        
-                        if (datetime.now() - last_activity).total_seconds() > max_idle_time:
-                            self.logger.warning(f"Agent {agent_id} has been idle for too long, restarting")
-                            await self.restart_agent(agent_id)
+                for agent_id, task in list(self._monitors.items()):
+                    if task.done() and not task.cancelled() and task.exception() is not None:
+                        self.logger.error(f"Health monitor for agent {agent_id} crashed: {task.exception()}")
+                        del self._monitors[agent_id]
+                        self._ensure_monitor(agent_id)
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self.logger.error(f"Error in health monitor: {e}")
     
+    async def _monitor_agent(self, agent_id: str):
+        """Periodically check one agent, on its own health_check_interval"""
+        config = self.agent_configs[agent_id]
+        interval = config.get("health_check_interval", self.health_check_interval)
+        max_idle_time = config.get("max_idle_time")
+        while self.is_running:
+            await asyncio.sleep(interval)
+            
+            # Nothing to act on unless the agent failed or is past its
+            # (opt-in) idle deadline
+            agent = self.agents.get(agent_id)
+            if agent is not None and self.agent_status.get(agent_id) != AgentStatus.ERROR:
+                if max_idle_time is None:
+                    continue
+                last_activity_ts = agent.last_activity_ts
+                if last_activity_ts is None or time.monotonic() - last_activity_ts <= max_idle_time:
+                    continue
+            
+            await self._guarded_health_check(agent_id)
+    
+    def _ensure_monitor(self, agent_id: str):
+        """Start the agent's health monitor unless one is already active"""
+        task = self._monitors.get(agent_id)
+        if self.is_running and (task is None or task.done()):
+            self._monitors[agent_id] = asyncio.create_task(self._monitor_agent(agent_id))
+    
+    def _cancel_monitor(self, agent_id: str):
+        """Cancel the agent's health monitor"""
+        task = self._monitors.get(agent_id)
+        # A monitor restarting its own agent keeps running
+        if task is None or task is asyncio.current_task():
+            return
+        del self._monitors[agent_id]
+        task.cancel()
+    
+    async def _guarded_health_check(self, agent_id: str):
+        """Run a health check while holding the health-check semaphore"""
+        async with self._health_check_semaphore:
+            await self._check_agent_health(agent_id)
+    
+    async def _check_agent_health(self, agent_id: str):
+        """Check one agent and restart it if it failed or went idle"""
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            return
+        config = self.agent_configs[agent_id]
+        
+        # Skip if auto-restart is disabled
+        if not config.get("auto_restart", True):
+            return
+        
+        # Check if agent is in error state
+        if self.agent_status[agent_id] == AgentStatus.ERROR:
+            self.logger.warning(f"Agent {agent_id} is in error state, attempting restart")
+            await self.restart_agent(agent_id)
+            return
+        
+        # Idle restarts are opt-in: only agents registered with a max_idle_time
+        max_idle_time = config.get("max_idle_time")
+        if max_idle_time is None:
+            return
+        # Agents whose get_health does blocking I/O can opt into a worker thread
+        if config.get("blocking_health", False):
+            health = await asyncio.get_running_loop().run_in_executor(None, agent.get_health)
+        else:
+            health = agent.get_health()
+        last_activity_ts = health.get("last_activity_ts")
+        if last_activity_ts is not None and time.monotonic() - last_activity_ts > max_idle_time:
+            self.logger.warning(f"Agent {agent_id} has been idle for too long, restarting")
+            await self.restart_agent(agent_id)
+    
     def get_agent_metrics(self, agent_id: str) -> Optional[Dict[str, Any]]:
         """Get metrics for a specific agent"""
         if agent_id not in self.agents:
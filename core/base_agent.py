@@ -6,7 +6,8 @@ import asyncio
 import logging
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Callable
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional, Callable, Sequence, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import uuid
@@ -34,7 +35,7 @@ class AgentPriority(Enum):
     CRITICAL = 4
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentMetrics:
     """Agent performance metrics"""
     messages_processed: int = 0
@@ -45,6 +46,7 @@ class AgentMetrics:
     uptime: float = 0.0
     memory_usage: float = 0.0
     cpu_usage: float = 0.0
+    messages_dropped: int = 0
 
 
 class BaseAgent(ABC):
@@ -71,29 +73,62 @@ class BaseAgent(ABC):
         self.config = config
         self.status = AgentStatus.STOPPED
         self.priority = AgentPriority.NORMAL
-        self.capabilities: List[str] = []
-        self.dependencies: List[str] = []
+        # Subclasses may assign lists; start() freezes both into tuples
+        self.capabilities: Sequence[str] = []
+        self.dependencies: Sequence[str] = []
         
         # Initialize components
         self.logger = logging.getLogger(f"agent.{agent_id}")
         self.message_bus: Optional[MessageBus] = None
         self.context_manager: Optional[ContextManager] = None
+        # Agents running in this process, keyed by agent ID (shared by AgentManager)
+        self.local_agents: Dict[str, "BaseAgent"] = {}
         
         # Metrics and monitoring
         self.metrics = AgentMetrics()
         self.start_time: Optional[datetime] = None
+        # time.monotonic() of the last processed message in the current run
+        self.last_activity_ts: Optional[float] = None
+        # time.monotonic() of the last processed message ever, and the offset that
+        # converts monotonic readings to wall-clock time (for reporting only)
+        self._last_activity_mono: Optional[float] = None
+        self._wallclock_offset = time.time() - time.monotonic()
+        # (monotonic time, ISO string) of the last activity reported by get_health
+        self._last_activity_reported: Tuple[Optional[float], Optional[str]] = (None, None)
         self.error_count = 0
         self.max_retries = config.get("max_retries", 3)
         
+        # Message IDs: agent ID and a per-instance random tag, plus a sequence number
+        self._message_id_prefix = f"{agent_id}-{uuid.uuid4().hex[:8]}-"
+        self._message_seq = 0
+        
         # Message processing
-        self.message_queue = asyncio.Queue()
+        # Bounded so a stalled agent cannot grow its backlog without limit. The
+        # processor does not call task_done(), so join() is not supported.
+        self.message_queue = asyncio.Queue(maxsize=config.get("queue_max", 4096))
         self.processing_task: Optional[asyncio.Task] = None
         self.shutdown_event = asyncio.Event()
+        # Set while the agent is RUNNING; the processor waits on it instead of
+        # checking the status for every message
+        self._running_event = asyncio.Event()
+        # Direct dispatch: a message that arrives while the processor is parked on an
+        # empty queue, with nothing more waiting on the bus, is processed straight
+        # from the bus callback. _direct_done is cleared meanwhile so the processor
+        # cannot overtake it.
+        self.direct_dispatch = config.get("direct_dispatch", True)
+        self._processor_parked = False
+        self._direct_done = asyncio.Event()
+        self._direct_done.set()
         
         # Callbacks
         self.on_message_callback: Optional[Callable] = None
         self.on_error_callback: Optional[Callable] = None
         self.on_status_change_callback: Optional[Callable] = None
+        # Pending changes for an async status callback, drained by one dispatcher task.
+        # Unbounded: transitions are rare and none may be lost (e.g. RUNNING -> ERROR).
+        self._status_callback_is_async = False
+        self._status_changes: Deque[Tuple[AgentStatus, AgentStatus]] = deque()
+        self._status_dispatch_task: Optional[asyncio.Task] = None
         
         # Initialize agent-specific components
         self._initialize_agent()
@@ -110,8 +145,13 @@ class BaseAgent(ABC):
             bool: True if started successfully, False otherwise
         """
         try:
-            self.logger.info(f"Starting agent {self.agent_id}")
+            self.logger.info("Starting agent %s", self.agent_id)
             self._set_status(AgentStatus.STARTING)
+            self.shutdown_event.clear()
+            
+            # Freeze capabilities/dependencies so reports can share them without copying
+            self.capabilities = tuple(self.capabilities)
+            self.dependencies = tuple(self.dependencies)
             
             # Initialize dependencies
             if not await self._initialize_dependencies():
@@ -124,8 +164,10 @@ class BaseAgent(ABC):
             await self._on_start()
             
             self.start_time = datetime.now()
+            self.last_activity_ts = None
+            self._wallclock_offset = time.time() - time.monotonic()
             self._set_status(AgentStatus.RUNNING)
-            self.logger.info(f"Agent {self.agent_id} started successfully")
+            self.logger.info("Agent %s started successfully", self.agent_id)
             return True
             
         except Exception as e:
@@ -141,7 +183,7 @@ class BaseAgent(ABC):
             bool: True if stopped successfully, False otherwise
         """
         try:
-            self.logger.info(f"Stopping agent {self.agent_id}")
+            self.logger.info("Stopping agent %s", self.agent_id)
             self._set_status(AgentStatus.SHUTTING_DOWN)
             
             # Signal shutdown
@@ -159,7 +201,7 @@ class BaseAgent(ABC):
             await self._on_stop()
             
             self._set_status(AgentStatus.STOPPED)
-            self.logger.info(f"Agent {self.agent_id} stopped successfully")
+            self.logger.info("Agent %s stopped successfully", self.agent_id)
             return True
             
         except Exception as e:
@@ -170,7 +212,7 @@ class BaseAgent(ABC):
         """Pause the agent."""
         try:
             self._set_status(AgentStatus.PAUSED)
-            self.logger.info(f"Agent {self.agent_id} paused")
+            self.logger.info("Agent %s paused", self.agent_id)
             return True
         except Exception as e:
             self.logger.error(f"Failed to pause agent {self.agent_id}: {e}")
@@ -181,12 +223,17 @@ class BaseAgent(ABC):
         try:
             if self.status == AgentStatus.PAUSED:
                 self._set_status(AgentStatus.RUNNING)
-                self.logger.info(f"Agent {self.agent_id} resumed")
+                self.logger.info("Agent %s resumed", self.agent_id)
             return True
         except Exception as e:
             self.logger.error(f"Failed to resume agent {self.agent_id}: {e}")
             return False
     
+    def _next_message_id(self) -> str:
+        """Generate a unique ID for a message sent by this agent"""
+        self._message_seq += 1
+        return f"{self._message_id_prefix}{self._message_seq:x}"
+    
     async def send_message(self, target_agent: str, message_type: str, data: Dict[str, Any], 
                           priority: AgentPriority = AgentPriority.NORMAL) -> bool:
         """
@@ -206,7 +253,7 @@ class BaseAgent(ABC):
             return False
         
         message = Message(
-            id=str(uuid.uuid4()),
+            id=self._next_message_id(),
             sender=self.agent_id,
             recipient=target_agent,
             type=message_type,
@@ -235,7 +282,7 @@ class BaseAgent(ABC):
             return False
         
         message = Message(
-            id=str(uuid.uuid4()),
+            id=self._next_message_id(),
             sender=self.agent_id,
             recipient="*",  # Broadcast to all
             type=message_type,
@@ -257,25 +304,23 @@ class BaseAgent(ABC):
             Dict containing the response
         """
         try:
-            start_time = time.time()
+            metrics = self.metrics
+            start = time.monotonic()
             
-            # Update metrics
-            self.metrics.last_activity = datetime.now()
+            # Update metrics (wall-clock time and averages are derived in get_health)
+            self.last_activity_ts = self._last_activity_mono = start
             
             # Process the message
             result = await self._process_message_impl(message)
             
             # Update processing metrics
-            processing_time = time.time() - start_time
-            self.metrics.messages_processed += 1
-            self.metrics.total_processing_time += processing_time
-            self.metrics.average_processing_time = (
-                self.metrics.total_processing_time / self.metrics.messages_processed
-            )
+            metrics.messages_processed += 1
+            metrics.total_processing_time += time.monotonic() - start
             
             # Call message callback if set
-            if self.on_message_callback:
-                await self.on_message_callback(message, result)
+            callback = self.on_message_callback
+            if callback is not None:
+                await callback(message, result)
             
             return result
             
@@ -285,8 +330,9 @@ class BaseAgent(ABC):
             self.error_count += 1
             
             # Call error callback if set
-            if self.on_error_callback:
-                await self.on_error_callback(message, e)
+            callback = self.on_error_callback
+            if callback is not None:
+                await callback(message, e)
             
             return {"error": str(e), "success": False}
     
@@ -305,28 +351,103 @@ class BaseAgent(ABC):
     
     async def _message_processor(self):
         """Background task for processing messages from the queue."""
+        queue = self.message_queue
+        running = self._running_event
+        direct_done = self._direct_done
+        batch_max = self.config.get("batch_max", 64)
+        # Agents that override process_message get it called for every message
+        batch_inline = type(self).process_message is BaseAgent.process_message
+        
+        # stop() cancels this task, so waiting on the queue needs no timeout.
+        # While the agent is not running, messages stay queued.
         while not self.shutdown_event.is_set():
             try:
-                # Wait for message with timeout
+                await running.wait()
+                
+                # Wait for one message, then take whatever else is already queued
+                self._processor_parked = True
                 try:
-                    message = await asyncio.wait_for(
-                        self.message_queue.get(), timeout=1.0
-                    )
-                except asyncio.TimeoutError:
+                    batch = [await queue.get()]
+                finally:
+                    self._processor_parked = False
+                while len(batch) < batch_max:
+                    try:
+                        batch.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                
+                # Let a directly dispatched message finish first to keep arrival order
+                if not direct_done.is_set():
+                    await direct_done.wait()
+                
+                if batch_inline:
+                    await self._process_batch(batch)
                     continue
                 
-                # Process message if agent is running
-                if self.status == AgentStatus.RUNNING:
+                for message in batch:
+                    # Hold the rest of the batch if the agent was paused meanwhile
+                    if not running.is_set():
+                        await running.wait()
                     await self.process_message(message)
                 
-                # Mark task as done
-                self.message_queue.task_done()
-                
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self.logger.error(f"Error in message processor: {e}")
     
+    async def _process_batch(self, batch: List[Message]):
+        """
+        Process a batch of queued messages like process_message does, but
+        accumulate the counters locally and commit them once per batch.
+        
+        Args:
+            batch: Messages taken from the queue, in arrival order
+        """
+        running = self._running_event
+        impl = self._process_message_impl
+        monotonic = time.monotonic
+        processed = failed = 0
+        elapsed = 0.0
+        
+        try:
+            for message in batch:
+                # Hold the rest of the batch if the agent was paused meanwhile,
+                # publishing what was processed so far
+                if not running.is_set():
+                    self._commit_metrics(processed, failed, elapsed)
+                    processed = failed = 0
+                    elapsed = 0.0
+                    await running.wait()
+                
+                start = monotonic()
+                self.last_activity_ts = self._last_activity_mono = start
+                try:
+                    result = await impl(message)
+                    processed += 1
+                    elapsed += monotonic() - start
+                    
+                    callback = self.on_message_callback
+                    if callback is not None:
+                        await callback(message, result)
+                    
+                except Exception as e:
+                    self.logger.error(f"Error processing message: {e}")
+                    failed += 1
+                    
+                    callback = self.on_error_callback
+                    if callback is not None:
+                        await callback(message, e)
+        finally:
+            self._commit_metrics(processed, failed, elapsed)
+    
+    def _commit_metrics(self, processed: int, failed: int, elapsed: float):
+        """Add counters accumulated over a batch to the agent metrics."""
+        metrics = self.metrics
+        metrics.messages_processed += processed
+        metrics.messages_failed += failed
+        metrics.total_processing_time += elapsed
+        self.error_count += failed
+    
     async def _initialize_dependencies(self) -> bool:
         """Initialize agent dependencies."""
         try:
@@ -348,17 +469,74 @@ class BaseAgent(ABC):
             return False
     
     async def _handle_incoming_message(self, message: Message):
-        """Handle incoming message by adding it to the queue."""
-        await self.message_queue.put(message)
+        """Handle incoming message, bypassing the queue when the processor is idle."""
+        if (self.direct_dispatch and self._processor_parked and self._direct_done.is_set()
+                and self._running_event.is_set() and self.message_queue.empty()
+                and self._bus_backlog_empty()):
+            # Nothing is queued or in flight, so processing here keeps arrival order.
+            # The bus waits for this call, so any backlog must go through the
+            # bounded message_queue instead (checked above).
+            self._direct_done.clear()
+            try:
+                await self.process_message(message)
+            finally:
+                self._direct_done.set()
+            return
+        
+        self.enqueue_message(message)
+    
+    def _bus_backlog_empty(self) -> bool:
+        """Check that the bus holds no further messages for this agent."""
+        bus_queue = self.message_bus.message_queues.get(self.agent_id) if self.message_bus else None
+        return bus_queue is None or bus_queue.empty()
+    
+    def enqueue_message(self, message: Message) -> bool:
+        """
+        Queue a message for processing without waiting.
+        
+        Returns:
+            bool: False if the queue is full and the message was dropped
+        """
+        try:
+            self.message_queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.metrics.messages_dropped += 1
+            self.logger.warning("Message queue full, dropping message %s", message.id)
+            return False
     
     def _set_status(self, status: AgentStatus):
         """Set agent status and notify callbacks."""
         old_status = self.status
         self.status = status
+        if status == AgentStatus.RUNNING:
+            self._running_event.set()
+        else:
+            self._running_event.clear()
         
-        # Call status change callback if set
-        if self.on_status_change_callback:
-            asyncio.create_task(self.on_status_change_callback(old_status, status))
+        # Call status change callback if set. Sync callbacks run inline; async ones
+        # are queued for the dispatcher so a burst of changes shares one task.
+        callback = self.on_status_change_callback
+        if callback is None:
+            return
+        if not self._status_callback_is_async:
+            result = callback(old_status, status)
+            if asyncio.iscoroutine(result):
+                asyncio.create_task(result)
+            return
+        
+        self._status_changes.append((old_status, status))
+        if self._status_dispatch_task is None or self._status_dispatch_task.done():
+            self._status_dispatch_task = asyncio.create_task(self._dispatch_status_changes())
+    
+    async def _dispatch_status_changes(self):
+        """Deliver queued status changes to the async status callback, in order."""
+        while self._status_changes:
+            old_status, status = self._status_changes.popleft()
+            try:
+                await self.on_status_change_callback(old_status, status)
+            except Exception as e:
+                self.logger.error(f"Error in status change callback: {e}")
     
     async def _on_start(self):
         """Called when agent starts. Override in subclasses."""
@@ -374,17 +552,29 @@ class BaseAgent(ABC):
         if self.start_time:
             uptime = (datetime.now() - self.start_time).total_seconds()
         
+        metrics = self.metrics
+        if metrics.messages_processed:
+            metrics.average_processing_time = metrics.total_processing_time / metrics.messages_processed
+        
+        # Convert the last activity time only when it changed since the last call
+        last_activity_mono = self._last_activity_mono
+        if last_activity_mono is not None and last_activity_mono != self._last_activity_reported[0]:
+            metrics.last_activity = datetime.fromtimestamp(self._wallclock_offset + last_activity_mono)
+            self._last_activity_reported = (last_activity_mono, metrics.last_activity.isoformat())
+        
         return {
             "agent_id": self.agent_id,
             "status": self.status.value,
             "uptime": uptime,
             "error_count": self.error_count,
+            "last_activity_ts": self.last_activity_ts,
             "capabilities": self.capabilities,
             "metrics": {
-                "messages_processed": self.metrics.messages_processed,
-                "messages_failed": self.metrics.messages_failed,
-                "average_processing_time": self.metrics.average_processing_time,
-                "last_activity": self.metrics.last_activity.isoformat() if self.metrics.last_activity else None
+                "messages_processed": metrics.messages_processed,
+                "messages_failed": metrics.messages_failed,
+                "messages_dropped": metrics.messages_dropped,
+                "average_processing_time": metrics.average_processing_time,
+                "last_activity": self._last_activity_reported[1]
             }
         }
     
@@ -409,6 +599,7 @@ class BaseAgent(ABC):
     def set_status_change_callback(self, callback: Callable):
         """Set callback for status changes."""
         self.on_status_change_callback = callback
+        self._status_callback_is_async = asyncio.iscoroutinefunction(callback)
 
 
 
@@ -3,15 +3,38 @@ Context Manager - Shared state and context management for agents
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
 import json
 import pickle
-from typing import Dict, Any, List, Optional, Set, Callable
+import time
+from typing import AbstractSet, Dict, Any, FrozenSet, List, Mapping, Optional, Set, Callable, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
 import threading
 import weakref
+from contextlib import contextmanager
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
+
+# Number of lock shards; a power of two so the shard index is a mask of the hash
+_SHARD_COUNT = 32
+
+# Heap entries the expiry sweep handles per shard lock hold
+_EXPIRY_BATCH = 256
+
+# Shared tags of every untagged item
+_EMPTY_TAGS: FrozenSet[str] = frozenset()
+
+# Read-only stand-in for an owner with no items
+_EMPTY_CONTEXT: Mapping[str, "ContextItem"] = MappingProxyType({})
 
 
 class ContextScope(Enum):
@@ -22,7 +45,28 @@ class ContextScope(Enum):
     USER = "user"          # User-specific data
 
 
-@dataclass
+# Scope values and the reverse lookup, cheaper than scope.value and ContextScope(value)
+_SCOPE_VALUE: Dict[ContextScope, str] = {scope: scope.value for scope in ContextScope}
+_SCOPE_BY_VALUE: Dict[str, ContextScope] = {scope.value: scope for scope in ContextScope}
+
+
+def _as_scope(scope: Any) -> ContextScope:
+    """Normalize a scope given as a ContextScope or its value (e.g. "agent")"""
+    scope = _SCOPE_BY_VALUE.get(scope, scope) if isinstance(scope, str) else scope
+    if scope.__class__ is not ContextScope:
+        raise TypeError(f"scope must be a ContextScope, got {scope!r}")
+    return scope
+
+# export_data section of each scope; the global section has no owner level
+_EXPORT_SECTIONS: Dict[ContextScope, str] = {
+    ContextScope.GLOBAL: "global_context",
+    ContextScope.AGENT: "agent_contexts",
+    ContextScope.SESSION: "session_contexts",
+    ContextScope.USER: "user_contexts"
+}
+
+
+@dataclass(slots=True)
 class ContextItem:
     """Context item with metadata"""
     key: str
@@ -32,19 +76,36 @@ class ContextItem:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     ttl: Optional[int] = None  # Time to live in seconds
-    tags: Set[str] = field(default_factory=set)
+    tags: FrozenSet[str] = _EMPTY_TAGS
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # time.monotonic() after which the item is expired, None without a ttl
+    _expires_at: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.ttl is not None:
+            # Items loaded from persistence may be partway through their ttl already
+            age = (datetime.now() - self.updated_at).total_seconds()
+            self._expires_at = time.monotonic() + self.ttl - age
     
-    def is_expired(self) -> bool:
-        """Check if the item has expired"""
-        if self.ttl is None:
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """
+        Check if the item has expired.
+        
+        Args:
+            now: time.monotonic() reading to compare against, so bulk checks
+                can share one
+        """
+        expires_at = self._expires_at
+        if expires_at is None:
             return False
-        return (datetime.now() - self.updated_at).total_seconds() > self.ttl
+        return (time.monotonic() if now is None else now) > expires_at
     
     def update(self, value: Any, metadata: Optional[Dict[str, Any]] = None):
         """Update the item value and metadata"""
         self.value = value
         self.updated_at = datetime.now()
+        if self.ttl is not None:
+            self._expires_at = time.monotonic() + self.ttl
         if metadata:
             self.metadata.update(metadata)
     
@@ -53,7 +114,7 @@ class ContextItem:
         return {
             "key": self.key,
             "value": self.value,
-            "scope": self.scope.value,
+            "scope": _SCOPE_VALUE[self.scope],
             "owner": self.owner,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
@@ -79,11 +140,9 @@ class ContextManager:
     def __init__(self):
         self.logger = logging.getLogger("context_manager")
         
-        # Context storage by scope
-        self.global_context: Dict[str, ContextItem] = {}
-        self.agent_contexts: Dict[str, Dict[str, ContextItem]] = {}
-        self.session_contexts: Dict[str, Dict[str, ContextItem]] = {}
-        self.user_contexts: Dict[str, Dict[str, ContextItem]] = {}
+        # Context storage: (scope, owner) -> key -> item. The global scope is a
+        # single context whose owner is "" (see _context_id).
+        self._contexts: Dict[Tuple[ContextScope, str], Dict[str, ContextItem]] = {}
         
         # Event callbacks
         self.update_callbacks: Dict[str, List[Callable]] = {}
@@ -93,14 +152,66 @@ class ContextManager:
         self.cleanup_interval = 300  # 5 minutes
         self.cleanup_task: Optional[asyncio.Task] = None
         self.is_running = False
+        self.last_cleanup: Optional[datetime] = None
+        # Held for the whole sweep, which yields to the event loop between batches
+        self._cleanup_lock = asyncio.Lock()
+        
+        # Thread safety: one lock per shard of (scope, owner) pairs, so unrelated
+        # owners never contend. Only writers take it; reads are single dict
+        # lookups, which are atomic, so they go without. Callbacks run after the
+        # lock is released.
+        self._shards = [threading.Lock() for _ in range(_SHARD_COUNT)]
+        
+        # Expiry schedule per shard: a heap of (expires_at, seq, scope, owner, key)
+        # so cleanup only visits items that are due, plus the earliest scheduled
+        # time per item so repeated sets of a key do not grow the heap
+        self._expiry_heaps: List[List[Tuple[float, int, ContextScope, str, str]]] = [
+            [] for _ in range(_SHARD_COUNT)
+        ]
+        self._expiry_scheduled: List[Dict[Tuple[ContextScope, str, str], float]] = [
+            {} for _ in range(_SHARD_COUNT)
+        ]
+        self._expiry_seq = itertools.count()
         
-        # Thread safety
-        self._lock = threading.RLock()
+        # Tag index: (scope, owner) -> tag -> keys of the items carrying that tag.
+        # Maintained under the shard lock of the (scope, owner) pair.
+        self._tag_index: Dict[Tuple[ContextScope, str], Dict[str, Set[str]]] = {}
         
-        # Statistics
-        self.total_items = 0
+        # Statistics. Item and update counts are kept per shard and summed on read.
+        self._item_counts = [0] * _SHARD_COUNT
+        self._update_counts = [0] * _SHARD_COUNT
         self.expired_items = 0
-        self.update_count = 0
+    
+    @property
+    def total_items(self) -> int:
+        """Number of items stored, summed over all shards"""
+        return sum(self._item_counts)
+    
+    @property
+    def update_count(self) -> int:
+        """Number of set/update calls, summed over all shards"""
+        return sum(self._update_counts)
+    
+    @staticmethod
+    def _context_id(scope: ContextScope, owner: str) -> Tuple[ContextScope, str]:
+        """Get the storage key for a scope and owner"""
+        # The global scope is one context whatever the owner
+        return (scope, "") if scope is ContextScope.GLOBAL else (scope, owner)
+    
+    def _shard_index(self, scope: ContextScope, owner: str) -> int:
+        """Get the shard index for a scope and owner"""
+        return hash(self._context_id(scope, owner)) & (_SHARD_COUNT - 1)
+    
+    @contextmanager
+    def _all_shards(self):
+        """Hold every shard lock, always acquired in the same order"""
+        for lock in self._shards:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._shards):
+                lock.release()
     
     async def start(self):
         """Start the context manager"""
@@ -145,46 +256,41 @@ class ContextManager:
         Returns:
             bool: True if set successfully
         """
-        try:
-            with self._lock:
-                item = ContextItem(
-                    key=key,
-                    value=value,
-                    scope=scope,
-                    owner=owner,
-                    ttl=ttl,
-                    tags=tags or set(),
-                    metadata=metadata or {}
-                )
-                
-                # Store in appropriate scope
-                if scope == ContextScope.GLOBAL:
-                    self.global_context[key] = item
-                elif scope == ContextScope.AGENT:
-                    if owner not in self.agent_contexts:
-                        self.agent_contexts[owner] = {}
-                    self.agent_contexts[owner][key] = item
-                elif scope == ContextScope.SESSION:
-                    if owner not in self.session_contexts:
-                        self.session_contexts[owner] = {}
-                    self.session_contexts[owner][key] = item
-                elif scope == ContextScope.USER:
-                    if owner not in self.user_contexts:
-                        self.user_contexts[owner] = {}
-                    self.user_contexts[owner][key] = item
-                
-                self.total_items += 1
-                self.update_count += 1
-                
-                # Trigger update callbacks
-                self._trigger_callbacks("update", key, item)
-                
-                self.logger.debug(f"Set context item: {key} in scope {scope.value}")
-                return True
-                
-        except Exception as e:
-            self.logger.error(f"Error setting context item {key}: {e}")
-            return False
+        scope = _as_scope(scope)
+        shard = self._shard_index(scope, owner)
+        with self._shards[shard]:
+            item = ContextItem(
+                key=key,
+                value=value,
+                scope=scope,
+                owner=owner,
+                ttl=ttl,
+                # Frozen, since the tag index must not change behind our back
+                tags=frozenset(tags) if tags else _EMPTY_TAGS,
+                metadata=metadata or {}
+            )
+            
+            previous = self._get_item(key, scope, owner)
+            if previous is not None and previous.tags:
+                self._unindex_tags(scope, owner, key, previous.tags)
+            if item.tags:
+                self._index_tags(scope, owner, key, item.tags)
+            
+            # Store in appropriate scope
+            self._contexts.setdefault(self._context_id(scope, owner), {})[key] = item
+            
+            self._item_counts[shard] += 1
+            self._update_counts[shard] += 1
+            
+            if item._expires_at is not None:
+                self._schedule_expiry(shard, scope, owner, key, item._expires_at)
+        
+        # Trigger update callbacks
+        self._trigger_callbacks("update", key, item)
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Set context item: %s in scope %s", key, _SCOPE_VALUE[scope])
+        return True
     
     def get(self, key: str, scope: ContextScope = ContextScope.GLOBAL,
             owner: str = "system", default: Any = None) -> Any:
@@ -200,18 +306,13 @@ class ContextManager:
         Returns:
             The item value or default
         """
-        try:
-            with self._lock:
-                item = self._get_item(key, scope, owner)
-                
-                if item is None or item.is_expired():
-                    return default
-                
-                return item.value
-                
-        except Exception as e:
-            self.logger.error(f"Error getting context item {key}: {e}")
+        scope = _as_scope(scope)
+        item = self._get_item(key, scope, owner)
+        
+        if item is None or item.is_expired():
             return default
+        
+        return item.value
     
     def get_item(self, key: str, scope: ContextScope = ContextScope.GLOBAL,
                  owner: str = "system") -> Optional[ContextItem]:
@@ -226,18 +327,13 @@ class ContextManager:
         Returns:
             ContextItem or None if not found
         """
-        try:
-            with self._lock:
-                item = self._get_item(key, scope, owner)
-                
-                if item is None or item.is_expired():
-                    return None
-                
-                return item
-                
-        except Exception as e:
-            self.logger.error(f"Error getting context item {key}: {e}")
+        scope = _as_scope(scope)
+        item = self._get_item(key, scope, owner)
+        
+        if item is None or item.is_expired():
             return None
+        
+        return item
     
     def delete(self, key: str, scope: ContextScope = ContextScope.GLOBAL,
                owner: str = "system") -> bool:
@@ -252,37 +348,24 @@ class ContextManager:
         Returns:
             bool: True if deleted successfully
         """
-        try:
-            with self._lock:
-                item = self._get_item(key, scope, owner)
-                
-                if item is None:
-                    return False
-                
-                # Remove from storage
-                if scope == ContextScope.GLOBAL:
-                    del self.global_context[key]
-                elif scope == ContextScope.AGENT:
-                    if owner in self.agent_contexts and key in self.agent_contexts[owner]:
-                        del self.agent_contexts[owner][key]
-                elif scope == ContextScope.SESSION:
-                    if owner in self.session_contexts and key in self.session_contexts[owner]:
-                        del self.session_contexts[owner][key]
-                elif scope == ContextScope.USER:
-                    if owner in self.user_contexts and key in self.user_contexts[owner]:
-                        del self.user_contexts[owner][key]
-                
-                self.total_items -= 1
-                
-                # Trigger delete callbacks
-                self._trigger_callbacks("delete", key, item)
-                
-                self.logger.debug(f"Deleted context item: {key} from scope {scope.value}")
-                return True
-                
-        except Exception as e:
-            self.logger.error(f"Error deleting context item {key}: {e}")
-            return False
+        scope = _as_scope(scope)
+        shard = self._shard_index(scope, owner)
+        with self._shards[shard]:
+            item = self._pop_item(key, scope, owner)
+            
+            if item is None:
+                return False
+            
+            if item.tags:
+                self._unindex_tags(scope, owner, key, item.tags)
+            self._item_counts[shard] -= 1
+        
+        # Trigger delete callbacks
+        self._trigger_callbacks("delete", key, item)
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Deleted context item: %s from scope %s", key, _SCOPE_VALUE[scope])
+        return True
     
     def exists(self, key: str, scope: ContextScope = ContextScope.GLOBAL,
                owner: str = "system") -> bool:
@@ -297,14 +380,9 @@ class ContextManager:
         Returns:
             bool: True if item exists and is not expired
         """
-        try:
-            with self._lock:
-                item = self._get_item(key, scope, owner)
-                return item is not None and not item.is_expired()
-                
-        except Exception as e:
-            self.logger.error(f"Error checking context item {key}: {e}")
-            return False
+        scope = _as_scope(scope)
+        item = self._get_item(key, scope, owner)
+        return item is not None and not item.is_expired()
     
     def update(self, key: str, value: Any, scope: ContextScope = ContextScope.GLOBAL,
                owner: str = "system", metadata: Optional[Dict[str, Any]] = None) -> bool:
@@ -321,25 +399,23 @@ class ContextManager:
         Returns:
             bool: True if updated successfully
         """
-        try:
-            with self._lock:
-                item = self._get_item(key, scope, owner)
-                
-                if item is None:
-                    return False
-                
-                item.update(value, metadata)
-                self.update_count += 1
-                
-                # Trigger update callbacks
-                self._trigger_callbacks("update", key, item)
-                
-                self.logger.debug(f"Updated context item: {key} in scope {scope.value}")
-                return True
-                
-        except Exception as e:
-            self.logger.error(f"Error updating context item {key}: {e}")
-            return False
+        scope = _as_scope(scope)
+        shard = self._shard_index(scope, owner)
+        with self._shards[shard]:
+            item = self._get_item(key, scope, owner)
+            
+            if item is None:
+                return False
+            
+            item.update(value, metadata)
+            self._update_counts[shard] += 1
+        
+        # Trigger update callbacks
+        self._trigger_callbacks("update", key, item)
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Updated context item: %s in scope %s", key, _SCOPE_VALUE[scope])
+        return True
     
     def get_by_tags(self, tags: Set[str], scope: ContextScope = ContextScope.GLOBAL,
                     owner: str = "system") -> Dict[str, Any]:
@@ -354,28 +430,44 @@ class ContextManager:
         Returns:
             Dict of key-value pairs
         """
-        try:
-            with self._lock:
-                result = {}
-                
-                if scope == ContextScope.GLOBAL:
-                    items = self.global_context.values()
-                elif scope == ContextScope.AGENT:
-                    items = self.agent_contexts.get(owner, {}).values()
-                elif scope == ContextScope.SESSION:
-                    items = self.session_contexts.get(owner, {}).values()
-                elif scope == ContextScope.USER:
-                    items = self.user_contexts.get(owner, {}).values()
-                
-                for item in items:
-                    if not item.is_expired() and tags.issubset(item.tags):
-                        result[item.key] = item.value
-                
+        scope = _as_scope(scope)
+        result = {}
+        now = time.monotonic()
+        
+        if not tags:
+            # Every item matches an empty tag set. Take a snapshot of the
+            # items (a single C-level copy) so writers can keep changing the
+            # scope while it is scanned.
+            context = self._context_id(scope, owner)
+            items = tuple(self._contexts.get(context, _EMPTY_CONTEXT).values())
+            
+            for item in items:
+                if not item.is_expired(now):
+                    result[item.key] = item.value
+            return result
+        
+        # Intersect the posting lists of the tags, smallest first
+        index = self._tag_index.get(self._context_id(scope, owner))
+        if not index:
+            return result
+        postings = []
+        for tag in tags:
+            keys = index.get(tag)
+            if not keys:
                 return result
-                
-        except Exception as e:
-            self.logger.error(f"Error getting items by tags: {e}")
-            return {}
+            postings.append(keys)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for keys in postings[1:]:
+            candidates &= keys
+        
+        for key in candidates:
+            item = self._get_item(key, scope, owner)
+            # Recheck the tags, the item may have been replaced meanwhile
+            if item is not None and not item.is_expired(now) and tags.issubset(item.tags):
+                result[key] = item.value
+        
+        return result
     
     def clear_scope(self, scope: ContextScope, owner: str = "system") -> int:
         """
@@ -388,33 +480,20 @@ class ContextManager:
         Returns:
             int: Number of items cleared
         """
-        try:
-            with self._lock:
-                count = 0
-                
-                if scope == ContextScope.GLOBAL:
-                    count = len(self.global_context)
-                    self.global_context.clear()
-                elif scope == ContextScope.AGENT:
-                    if owner in self.agent_contexts:
-                        count = len(self.agent_contexts[owner])
-                        self.agent_contexts[owner].clear()
-                elif scope == ContextScope.SESSION:
-                    if owner in self.session_contexts:
-                        count = len(self.session_contexts[owner])
-                        self.session_contexts[owner].clear()
-                elif scope == ContextScope.USER:
-                    if owner in self.user_contexts:
-                        count = len(self.user_contexts[owner])
-                        self.user_contexts[owner].clear()
-                
-                self.total_items -= count
-                self.logger.info(f"Cleared {count} items from scope {scope.value}")
-                return count
-                
-        except Exception as e:
-            self.logger.error(f"Error clearing scope {scope.value}: {e}")
-            return 0
+        scope = _as_scope(scope)
+        shard = self._shard_index(scope, owner)
+        with self._shards[shard]:
+            # Detach the whole dict instead of deleting items one by one; the
+            # removed items are released after the lock is dropped
+            context = self._context_id(scope, owner)
+            items = self._contexts.pop(context, None)
+            
+            count = len(items) if items else 0
+            self._tag_index.pop(context, None)
+            self._item_counts[shard] -= count
+        
+        self.logger.info("Cleared %s items from scope %s", count, _SCOPE_VALUE[scope])
+        return count
     
     def on_update(self, key: str, callback: Callable):
         """Register a callback for item updates"""
@@ -430,101 +509,180 @@ class ContextManager:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get context manager statistics"""
-        with self._lock:
-            return {
-                "total_items": self.total_items,
-                "expired_items": self.expired_items,
-                "update_count": self.update_count,
-                "global_items": len(self.global_context),
-                "agent_contexts": len(self.agent_contexts),
-                "session_contexts": len(self.session_contexts),
-                "user_contexts": len(self.user_contexts),
-                "update_callbacks": sum(len(callbacks) for callbacks in self.update_callbacks.values()),
-                "delete_callbacks": sum(len(callbacks) for callbacks in self.delete_callbacks.values())
-            }
+        # Only sizes and counters are read, so no shard lock is needed
+        global_items = 0
+        owners = dict.fromkeys(ContextScope, 0)
+        for (scope, _), items in tuple(self._contexts.items()):
+            owners[scope] += 1
+            if scope is ContextScope.GLOBAL:
+                global_items = len(items)
+        
+        return {
+            "total_items": self.total_items,
+            "expired_items": self.expired_items,
+            "update_count": self.update_count,
+            "global_items": global_items,
+            "agent_contexts": owners[ContextScope.AGENT],
+            "session_contexts": owners[ContextScope.SESSION],
+            "user_contexts": owners[ContextScope.USER],
+            "update_callbacks": sum(len(callbacks) for callbacks in self.update_callbacks.values()),
+            "delete_callbacks": sum(len(callbacks) for callbacks in self.delete_callbacks.values())
+        }
     
     def export_data(self) -> Dict[str, Any]:
         """Export all context data for persistence"""
-        with self._lock:
-            return {
-                "global_context": {k: v.to_dict() for k, v in self.global_context.items()},
-                "agent_contexts": {
-                    agent: {k: v.to_dict() for k, v in items.items()}
-                    for agent, items in self.agent_contexts.items()
-                },
-                "session_contexts": {
-                    session: {k: v.to_dict() for k, v in items.items()}
-                    for session, items in self.session_contexts.items()
-                },
-                "user_contexts": {
-                    user: {k: v.to_dict() for k, v in items.items()}
-                    for user, items in self.user_contexts.items()
-                }
-            }
+        data: Dict[str, Dict[str, Any]] = {section: {} for section in _EXPORT_SECTIONS.values()}
+        with self._all_shards():
+            for (scope, owner), items in self._contexts.items():
+                exported = {k: v.to_dict() for k, v in items.items()}
+                if scope is ContextScope.GLOBAL:
+                    data["global_context"] = exported
+                else:
+                    data[_EXPORT_SECTIONS[scope]][owner] = exported
+        return data
     
     def import_data(self, data: Dict[str, Any]):
         """Import context data from persistence"""
         try:
-            with self._lock:
+            now = time.monotonic()
+            with self._all_shards():
                 # Clear existing data
-                self.global_context.clear()
-                self.agent_contexts.clear()
-                self.session_contexts.clear()
-                self.user_contexts.clear()
-                
-                # Import global context
-                for key, item_data in data.get("global_context", {}).items():
-                    item = self._dict_to_item(item_data)
-                    if item and not item.is_expired():
-                        self.global_context[key] = item
-                
-                # Import agent contexts
-                for agent, items in data.get("agent_contexts", {}).items():
-                    self.agent_contexts[agent] = {}
-                    for key, item_data in items.items():
-                        item = self._dict_to_item(item_data)
-                        if item and not item.is_expired():
-                            self.agent_contexts[agent][key] = item
-                
-                # Import session contexts
-                for session, items in data.get("session_contexts", {}).items():
-                    self.session_contexts[session] = {}
-                    for key, item_data in items.items():
-                        item = self._dict_to_item(item_data)
-                        if item and not item.is_expired():
-                            self.session_contexts[session][key] = item
-                
-                # Import user contexts
-                for user, items in data.get("user_contexts", {}).items():
-                    self.user_contexts[user] = {}
-                    for key, item_data in items.items():
-                        item = self._dict_to_item(item_data)
-                        if item and not item.is_expired():
-                            self.user_contexts[user][key] = item
-                
-                self.total_items = (
-                    len(self.global_context) +
-                    sum(len(items) for items in self.agent_contexts.values()) +
-                    sum(len(items) for items in self.session_contexts.values()) +
-                    sum(len(items) for items in self.user_contexts.values())
-                )
-                
-                self.logger.info(f"Imported {self.total_items} context items")
+                self._contexts.clear()
+                for heap in self._expiry_heaps:
+                    heap.clear()
+                for scheduled in self._expiry_scheduled:
+                    scheduled.clear()
+                self._tag_index.clear()
+                
+                # Import every scope's section
+                for scope, section in _EXPORT_SECTIONS.items():
+                    owned = data.get(section, {})
+                    if scope is ContextScope.GLOBAL:
+                        owned = {"": owned}
+                    for owner, items in owned.items():
+                        imported = self._contexts.setdefault(self._context_id(scope, owner), {})
+                        for key, item_data in items.items():
+                            item = self._dict_to_item(item_data)
+                            if item and not item.is_expired(now):
+                                imported[key] = item
+                
+                # Recount the items held by each shard, schedule their expiry and
+                # rebuild the tag index
+                item_counts = [0] * _SHARD_COUNT
+                for (scope, owner), items in self._contexts.items():
+                    shard = self._shard_index(scope, owner)
+                    item_counts[shard] += len(items)
+                    for key, item in items.items():
+                        if item._expires_at is not None:
+                            self._schedule_expiry(shard, scope, owner, key, item._expires_at)
+                        if item.tags:
+                            self._index_tags(scope, owner, key, item.tags)
+                self._item_counts = item_counts
+            
+            self.logger.info(f"Imported {self.total_items} context items")
                 
         except Exception as e:
             self.logger.error(f"Error importing context data: {e}")
     
+    def export_json(self) -> bytes:
+        """Export all context data as JSON, using orjson when it is installed"""
+        data = self.export_data()
+        if orjson is not None:
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, default=str).encode("utf-8")
+    
+    def import_json(self, data: bytes):
+        """Import context data from JSON produced by export_json"""
+        try:
+            parsed = orjson.loads(data) if orjson is not None else json.loads(data)
+        except ValueError as e:
+            self.logger.error(f"Error parsing context data: {e}")
+            return
+        self.import_data(parsed)
+    
     def _get_item(self, key: str, scope: ContextScope, owner: str) -> Optional[ContextItem]:
         """Get an item from the appropriate scope"""
-        if scope == ContextScope.GLOBAL:
-            return self.global_context.get(key)
-        elif scope == ContextScope.AGENT:
-            return self.agent_contexts.get(owner, {}).get(key)
-        elif scope == ContextScope.SESSION:
-            return self.session_contexts.get(owner, {}).get(key)
-        elif scope == ContextScope.USER:
-            return self.user_contexts.get(owner, {}).get(key)
-        return None
+        return self._contexts.get(self._context_id(scope, owner), _EMPTY_CONTEXT).get(key)
+    
+    def _pop_item(self, key: str, scope: ContextScope, owner: str) -> Optional[ContextItem]:
+        """Remove an item from the appropriate scope and return it"""
+        items = self._contexts.get(self._context_id(scope, owner))
+        return items.pop(key, None) if items is not None else None
+    
+    def _index_tags(self, scope: ContextScope, owner: str, key: str, tags: AbstractSet[str]):
+        """Add an item's tags to the tag index. Caller holds the shard lock."""
+        index = self._tag_index.setdefault(self._context_id(scope, owner), {})
+        for tag in tags:
+            index.setdefault(tag, set()).add(key)
+    
+    def _unindex_tags(self, scope: ContextScope, owner: str, key: str, tags: AbstractSet[str]):
+        """Remove an item's tags from the tag index. Caller holds the shard lock."""
+        context = self._context_id(scope, owner)
+        index = self._tag_index.get(context)
+        if index is None:
+            return
+        for tag in tags:
+            keys = index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[tag]
+        if not index:
+            del self._tag_index[context]
+    
+    def _schedule_expiry(self, shard: int, scope: ContextScope, owner: str, key: str,
+                         expires_at: float):
+        """Schedule an item for the expiry sweep. Caller holds the shard lock."""
+        scheduled = self._expiry_scheduled[shard]
+        entry = (scope, owner, key)
+        planned = scheduled.get(entry)
+        # A later deadline is picked up when the planned entry comes due
+        if planned is None or expires_at < planned:
+            scheduled[entry] = expires_at
+            heapq.heappush(self._expiry_heaps[shard],
+                           (expires_at, next(self._expiry_seq), scope, owner, key))
+    
+    def _expire_due(self, shard: int, now: float, limit: int) -> int:
+        """
+        Remove due items of a shard. Caller holds the shard lock.
+        
+        Args:
+            shard: Shard index
+            now: time.monotonic() reading items are compared against
+            limit: Maximum number of heap entries to handle
+            
+        Returns:
+            int: Number of items removed
+        """
+        heap = self._expiry_heaps[shard]
+        scheduled = self._expiry_scheduled[shard]
+        count = 0
+        
+        for _ in range(limit):
+            if not heap or heap[0][0] > now:
+                break
+            expires_at, _, scope, owner, key = heapq.heappop(heap)
+            entry = (scope, owner, key)
+            # Skip entries superseded by an earlier deadline for the same item
+            if scheduled.get(entry) != expires_at:
+                continue
+            del scheduled[entry]
+            
+            item = self._get_item(key, scope, owner)
+            if item is None or item._expires_at is None:
+                continue
+            if item._expires_at > now:
+                # Updated or replaced since it was scheduled
+                self._schedule_expiry(shard, scope, owner, key, item._expires_at)
+                continue
+            
+            self._pop_item(key, scope, owner)
+            if item.tags:
+                self._unindex_tags(scope, owner, key, item.tags)
+            count += 1
+        
+        self._item_counts[shard] -= count
+        return count
     
     def _trigger_callbacks(self, event_type: str, key: str, item: ContextItem):
         """Trigger callbacks for an event"""
@@ -543,12 +701,12 @@ class ContextManager:
             return ContextItem(
                 key=data["key"],
                 value=data["value"],
-                scope=ContextScope(data["scope"]),
+                scope=_SCOPE_BY_VALUE[data["scope"]],
                 owner=data["owner"],
                 created_at=datetime.fromisoformat(data["created_at"]),
                 updated_at=datetime.fromisoformat(data["updated_at"]),
                 ttl=data.get("ttl"),
-                tags=set(data.get("tags", [])),
+                tags=frozenset(data.get("tags", ())),
                 metadata=data.get("metadata", {})
             )
         except Exception as e:
@@ -568,40 +726,31 @@ class ContextManager:
     
     async def _cleanup_expired_items(self):
         """Remove expired items from all scopes"""
-        try:
-            with self._lock:
-                # Clean global context
-                expired_keys = [k for k, v in self.global_context.items() if v.is_expired()]
-                for key in expired_keys:
-                    del self.global_context[key]
-                    self.expired_items += 1
-                
-                # Clean agent contexts
-                for agent, items in self.agent_contexts.items():
-                    expired_keys = [k for k, v in items.items() if v.is_expired()]
-                    for key in expired_keys:
-                        del items[key]
-                        self.expired_items += 1
-                
-                # Clean session contexts
-                for session, items in self.session_contexts.items():
-                    expired_keys = [k for k, v in items.items() if v.is_expired()]
-                    for key in expired_keys:
-                        del items[key]
-                        self.expired_items += 1
-                
-                # Clean user contexts
-                for user, items in self.user_contexts.items():
-                    expired_keys = [k for k, v in items.items() if v.is_expired()]
-                    for key in expired_keys:
-                        del items[key]
-                        self.expired_items += 1
-                
-                if expired_keys:
-                    self.logger.debug(f"Cleaned up {len(expired_keys)} expired items")
+        if self._cleanup_lock.locked():
+            # The previous sweep has not finished yet
+            return
+        
+        async with self._cleanup_lock:
+            try:
+                now = time.monotonic()
+                expired = 0
+                
+                # Only items whose scheduled expiry has passed are visited, in
+                # batches so neither a shard lock nor the event loop is held long
+                for shard, lock in enumerate(self._shards):
+                    heap = self._expiry_heaps[shard]
+                    while heap and heap[0][0] <= now:
+                        with lock:
+                            expired += self._expire_due(shard, now, _EXPIRY_BATCH)
+                        await asyncio.sleep(0)
+                
+                self.expired_items += expired
+                self.last_cleanup = datetime.now()
+                if expired:
+                    self.logger.debug(f"Cleaned up {expired} expired items")
                     
-        except Exception as e:
-            self.logger.error(f"Error cleaning up expired items: {e}")
+            except Exception as e:
+                self.logger.error(f"Error cleaning up expired items: {e}")
 
 
 
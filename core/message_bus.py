@@ -209,6 +209,30 @@ class MessageBus:
             self.messages_failed += 1
             return False
     
+    def record_message(self, message: Message):
+        """
+        Record a message that was delivered in-process, bypassing the queues.
+        
+        Args:
+            message: The message that was delivered directly
+        """
+        self._add_to_history(message)
+        self.messages_sent += 1
+        self.messages_delivered += 1
+    
+    def record_broadcast(self, message: Message, recipient_count: int):
+        """
+        Record a broadcast that was delivered in-process, bypassing the queues.
+        
+        Args:
+            message: The broadcast message
+            recipient_count: Number of agents it was delivered to
+        """
+        self._add_to_history(message)
+        self.broadcasts_sent += 1
+        self.messages_sent += recipient_count
+        self.messages_delivered += recipient_count
+    
     async def broadcast_message(self, message: Message) -> bool:
         """
         Broadcast a message to all subscribed agents.
@@ -228,11 +252,14 @@ class MessageBus:
             # Add to message history
             self._add_to_history(message)
             
-            # Send to all broadcast subscribers
+            # Send to all broadcast subscribers in one pass; the per-agent
+            # queues are unbounded, so enqueueing never has to wait
+            queues = self.message_queues
             sent_count = 0
             for agent_id in self.broadcast_subscribers:
-                if agent_id in self.message_queues:
-                    await self.message_queues[agent_id].put(message)
+                queue = queues.get(agent_id)
+                if queue is not None:
+                    queue.put_nowait(message)
                     sent_count += 1
             
             self.broadcasts_sent += 1
@@ -10,6 +10,7 @@ import asyncio
 import logging
 import signal
 import sys
+from dataclasses import asdict
 from typing import Dict, List, Any
 from pathlib import Path
 
@@ -19,7 +20,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from config.settings import Settings
 from core.agent_manager import AgentManager
 from core.message_bus import MessageBus
-from core.context_manager import ContextManager
+from core.context_manager import ContextManager, ContextScope
 from agents.chat_agent import ChatAgent
 from agents.task_agent import TaskAgent
 from agents.email_agent import EmailAgent
@@ -121,20 +122,20 @@ class AgenticFramework:
                 "version": "1.0.0",
                 "agents_count": len(self.agents),
                 "startup_time": asyncio.get_event_loop().time()
-            }, scope="global")
+            }, scope=ContextScope.GLOBAL)
             
             # Add agent list to global context
             agent_list = list(self.agents.keys())
-            self.context_manager.set("active_agents", agent_list, scope="global")
+            self.context_manager.set("active_agents", agent_list, scope=ContextScope.GLOBAL)
             
             # Add configuration settings to global context
             self.context_manager.set("settings", {
-                "database": self.settings.database.__dict__,
-                "logging": self.settings.logging.__dict__,
-                "api": self.settings.api.__dict__,
-                "security": self.settings.security.__dict__,
-                "monitoring": self.settings.monitoring.__dict__
-            }, scope="global")
+                "database": asdict(self.settings.config.database),
+                "logging": asdict(self.settings.config.logging),
+                "api": asdict(self.settings.config.api),
+                "security": asdict(self.settings.config.security),
+                "monitoring": asdict(self.settings.config.monitoring)
+            }, scope=ContextScope.GLOBAL)
         except Exception as e:
             self.logger.error(f"Error setting up global context: {e}")
     
@@ -259,5 +260,8 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Use uvloop when available; this has to happen before the loop exists
+    AgentManager.install_uvloop()
+    
     # Run the framework
     asyncio.run(main())
@@ -0,0 +1,36 @@
+"""
+Tests for pooled agent configs
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.agent_config import acquire_agent_config, release_agent_config
+
+
+class TestConfigPool(unittest.TestCase):
+    """Reusing a pooled config must not touch containers its caller passed in"""
+    
+    def test_release_keeps_caller_containers(self):
+        settings = {"a": 1}
+        dependencies = ["x"]
+        metadata = {"m": 2}
+        config = acquire_agent_config(
+            "pooled", settings=settings, dependencies=dependencies, metadata=metadata
+        )
+        release_agent_config(config)
+        
+        reused = acquire_agent_config("pooled_again")
+        
+        self.assertIs(reused, config)
+        self.assertEqual(settings, {"a": 1})
+        self.assertEqual(dependencies, ["x"])
+        self.assertEqual(metadata, {"m": 2})
+        self.assertEqual((reused.settings, reused.dependencies, reused.metadata), ({}, [], {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
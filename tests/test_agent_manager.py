@@ -0,0 +1,109 @@
+"""
+Tests for AgentManager health checks
+"""
+
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.agent_manager import AgentManager
+from core.base_agent import BaseAgent
+from core.message_bus import Message
+
+
+class IdleAgent(BaseAgent):
+    """Agent that does nothing with its messages"""
+    
+    async def _process_message_impl(self, message):
+        return {"success": True}
+
+
+class TestIdleRestart(unittest.IsolatedAsyncioTestCase):
+    """Agents are only restarted for idleness when registered with max_idle_time"""
+    
+    async def asyncSetUp(self):
+        self.manager = AgentManager()
+    
+    async def asyncTearDown(self):
+        await self.manager.stop()
+    
+    async def _start_idle_agent(self, config):
+        agent = IdleAgent("idle", {})
+        self.manager.register_agent(agent, config)
+        await self.manager.start()
+        # Pretend the last message was processed a minute ago
+        agent.last_activity_ts = time.monotonic() - 60
+        return agent
+    
+    async def test_no_idle_restart_by_default(self):
+        await self._start_idle_agent({"health_check_interval": 3600})
+        await self.manager._check_agent_health("idle")
+        self.assertEqual(self.manager.restart_count, 0)
+    
+    async def test_idle_restart_when_max_idle_time_set(self):
+        await self._start_idle_agent({"health_check_interval": 3600, "max_idle_time": 30})
+        await self.manager._check_agent_health("idle")
+        self.assertEqual(self.manager.restart_count, 1)
+    
+    async def test_idle_restart_with_blocking_health(self):
+        await self._start_idle_agent(
+            {"health_check_interval": 3600, "max_idle_time": 30, "blocking_health": True}
+        )
+        await self.manager._check_agent_health("idle")
+        self.assertEqual(self.manager.restart_count, 1)
+    
+    async def test_active_agent_is_not_restarted(self):
+        agent = await self._start_idle_agent({"health_check_interval": 3600, "max_idle_time": 30})
+        agent.last_activity_ts = time.monotonic()
+        await self.manager._check_agent_health("idle")
+        self.assertEqual(self.manager.restart_count, 0)
+
+    
+    async def test_monitor_restarts_idle_agent(self):
+        await self._start_idle_agent({"health_check_interval": 0.01, "max_idle_time": 30})
+        await asyncio.sleep(0.1)
+        self.assertGreaterEqual(self.manager.restart_count, 1)
+    
+    async def test_monitor_skips_agent_without_max_idle_time(self):
+        await self._start_idle_agent({"health_check_interval": 0.01})
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.manager.restart_count, 0)
+
+
+
+class TestLocalBroadcast(unittest.IsolatedAsyncioTestCase):
+    """Broadcasts skip the bus only for running agents with no bus backlog"""
+    
+    async def asyncSetUp(self):
+        self.manager = AgentManager()
+        self.agent = IdleAgent("a", {})
+        self.manager.register_agent(self.agent, {"health_check_interval": 3600})
+        await self.manager.start()
+        await self.manager.message_bus.subscribe_to_broadcasts("a")
+    
+    async def asyncTearDown(self):
+        await self.manager.stop()
+    
+    async def test_running_agent_gets_broadcast_directly(self):
+        self.assertTrue(await self.manager.broadcast_message("ping", {}))
+        self.assertEqual(self.agent.message_queue.qsize(), 1)
+    
+    async def test_broadcast_queues_behind_bus_backlog(self):
+        bus_queue = self.manager.message_bus.message_queues["a"]
+        bus_queue.put_nowait(Message(id="m1", sender="t", recipient="a", type="x", data={}))
+        await self.manager.broadcast_message("ping", {})
+        self.assertEqual(self.agent.message_queue.qsize(), 0)
+        self.assertEqual(bus_queue.qsize(), 2)
+    
+    async def test_stopped_agent_is_not_fed_directly(self):
+        await self.manager.stop_agent("a")
+        await self.manager.broadcast_message("ping", {})
+        self.assertEqual(self.agent.message_queue.qsize(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Tests for BaseAgent message intake
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.base_agent import BaseAgent
+from core.message_bus import Message, MessageBus
+
+
+class SlowAgent(BaseAgent):
+    """Agent whose messages take a while, so a backlog builds up"""
+    
+    async def _process_message_impl(self, message):
+        await asyncio.sleep(0.005)
+        return {"success": True}
+
+
+class TestMessageIntake(unittest.IsolatedAsyncioTestCase):
+    """Bus traffic must go through the bounded agent queue under load"""
+    
+    async def asyncSetUp(self):
+        self.bus = MessageBus()
+        await self.bus.start()
+        self.agent = SlowAgent("slow", {"queue_max": 4})
+        self.agent.message_bus = self.bus
+        await self.agent.start()
+    
+    async def asyncTearDown(self):
+        await self.agent.stop()
+        await self.bus.stop()
+    
+    async def test_bus_burst_is_bounded_by_agent_queue(self):
+        total = 50
+        peak_agent_queue = 0
+        
+        for i in range(total):
+            await self.bus.send_message(Message(
+                id=str(i), sender="test", recipient="slow", type="test", data={}
+            ))
+        
+        # Wait for the bus to hand everything over and the agent to drain
+        metrics = self.agent.metrics
+        for _ in range(500):
+            peak_agent_queue = max(peak_agent_queue, self.agent.message_queue.qsize())
+            if metrics.messages_processed + metrics.messages_dropped == total:
+                break
+            await asyncio.sleep(0.002)
+        
+        self.assertEqual(metrics.messages_processed + metrics.messages_dropped, total)
+        self.assertGreater(peak_agent_queue, 0)
+        self.assertLessEqual(peak_agent_queue, 4)
+        self.assertGreater(metrics.messages_dropped, 0)
+    
+    async def test_single_message_is_processed(self):
+        await self.bus.send_message(Message(
+            id="1", sender="test", recipient="slow", type="test", data={}
+        ))
+        for _ in range(100):
+            if self.agent.metrics.messages_processed:
+                break
+            await asyncio.sleep(0.002)
+        
+        self.assertEqual(self.agent.metrics.messages_processed, 1)
+        self.assertEqual(self.agent.metrics.messages_dropped, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
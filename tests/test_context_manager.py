@@ -0,0 +1,61 @@
+"""
+Tests for ContextManager JSON export
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import context_manager
+from core.context_manager import ContextManager, ContextScope
+
+
+class TestExportJson(unittest.TestCase):
+    """export_json must give the same result with and without orjson"""
+    
+    def _export_non_str_keys(self) -> dict:
+        cm = ContextManager()
+        cm.set("a", {1: "x"})
+        return json.loads(cm.export_json())
+    
+    @unittest.skipIf(context_manager.orjson is None, "orjson not installed")
+    def test_non_str_keys_with_orjson(self):
+        exported = self._export_non_str_keys()
+        self.assertEqual(exported["global_context"]["a"]["value"], {"1": "x"})
+    
+    def test_non_str_keys_with_stdlib_json(self):
+        with mock.patch.object(context_manager, "orjson", None):
+            exported = self._export_non_str_keys()
+        self.assertEqual(exported["global_context"]["a"]["value"], {"1": "x"})
+
+
+
+class TestScopeArgument(unittest.TestCase):
+    """Every method accepts a scope value string and rejects non-scopes alike"""
+    
+    def setUp(self):
+        self.cm = ContextManager()
+    
+    def test_string_scope_is_the_same_scope(self):
+        self.cm.set("k", 1, scope="agent", owner="a")
+        self.assertEqual(self.cm.get("k", scope=ContextScope.AGENT, owner="a"), 1)
+        self.assertTrue(self.cm.update("k", 2, scope="agent", owner="a"))
+        self.assertEqual(self.cm.clear_scope("agent", owner="a"), 1)
+    
+    def test_unknown_scope_raises_type_error(self):
+        for call in (
+            lambda: self.cm.set("k", 1, scope="nope"),
+            lambda: self.cm.get("k", scope="nope"),
+            lambda: self.cm.delete("k", scope="nope"),
+            lambda: self.cm.clear_scope("nope"),
+        ):
+            with self.assertRaises(TypeError):
+                call()
+
+
+if __name__ == "__main__":
+    unittest.main()
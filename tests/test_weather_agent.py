@@ -0,0 +1,150 @@
+"""
+Tests for WeatherAgent current-weather fetches
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.weather_agent import WeatherAgent, WeatherCondition, _new_id
+
+
+class TestSharedFetch(unittest.IsolatedAsyncioTestCase):
+    """Concurrent requests share one fetch without sharing its cancellation"""
+    
+    async def asyncSetUp(self):
+        self.agent = WeatherAgent("weather_agent", {})
+        await self.agent._initialize_default_locations()
+        self.fetches = 0
+        fetch = self.agent._fetch_current_weather
+        
+        async def slow_fetch(location):
+            self.fetches += 1
+            await asyncio.sleep(0.05)
+            return await fetch(location)
+        
+        self.agent._fetch_current_weather = slow_fetch
+    
+    async def test_waiters_share_one_fetch(self):
+        results = await asyncio.gather(
+            *(self.agent._get_current_weather("london") for _ in range(3))
+        )
+        self.assertEqual(self.fetches, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+    
+    async def test_waiter_survives_cancelled_fetch(self):
+        owner = asyncio.create_task(self.agent._get_current_weather("london"))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(self.agent._get_current_weather("london"))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        
+        weather = await waiter
+        
+        self.assertEqual(weather.location, "London")
+        self.assertTrue(owner.cancelled())
+        self.assertEqual(self.fetches, 2)
+
+
+
+class FakeResponse:
+    """Stands in for an aiohttp response"""
+    
+    def __init__(self, payload):
+        self.payload = payload
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    def raise_for_status(self):
+        pass
+    
+    async def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Stands in for an aiohttp.ClientSession, recording each GET"""
+    
+    def __init__(self, payload):
+        self.payload = payload
+        self.requests = []
+    
+    def get(self, url, params=None):
+        self.requests.append((url, params))
+        return FakeResponse(self.payload)
+
+
+class TestWeatherApi(unittest.IsolatedAsyncioTestCase):
+    """Current weather comes from the configured API over the pooled session"""
+    
+    PAYLOAD = {
+        "weather": [{"main": "Drizzle"}],
+        "main": {"temp": 11.5, "humidity": 81, "pressure": 1009},
+        "wind": {"speed": 5.0, "deg": 270},
+        "visibility": 8000,
+    }
+    
+    async def asyncSetUp(self):
+        self.agent = WeatherAgent("weather_agent", {"api_key": "k", "api_url": "https://api.test/weather"})
+        await self.agent._initialize_default_locations()
+        self.session = FakeSession(self.PAYLOAD)
+        self.agent._http = self.session
+    
+    async def test_payload_is_mapped_to_weather_data(self):
+        weather = await self.agent._get_current_weather("london")
+        
+        self.assertEqual(weather.location, "London")
+        self.assertEqual(weather.temperature, 11.5)
+        self.assertIs(weather.condition, WeatherCondition.RAIN)
+        self.assertEqual(weather.humidity, 81)
+        self.assertAlmostEqual(weather.wind_speed, 18.0)
+        self.assertEqual(weather.wind_direction, "W")
+        self.assertEqual(weather.pressure, 1009)
+        self.assertEqual(weather.visibility, 8.0)
+    
+    async def test_request_carries_location_and_key(self):
+        await self.agent._get_current_weather("london")
+        
+        url, params = self.session.requests[0]
+        self.assertEqual(url, "https://api.test/weather")
+        self.assertEqual(params["appid"], "k")
+        self.assertEqual((params["lat"], params["lon"]), (51.5074, -0.1278))
+        self.assertEqual(params["units"], "metric")
+    
+    async def test_unknown_condition_and_missing_fields(self):
+        self.session.payload = {"weather": [{"main": "Tornado"}]}
+        weather = await self.agent._get_current_weather("tokyo")
+        
+        self.assertIs(weather.condition, WeatherCondition.CLEAR)
+        self.assertEqual((weather.temperature, weather.wind_direction, weather.visibility), (0.0, "N", 0.0))
+
+
+class TestMessageIds(unittest.TestCase):
+    """Message IDs stay unique across a fork"""
+    
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_forked_child_does_not_reuse_parent_ids(self):
+        _new_id()  # fill the pool before forking
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write_end, _new_id().encode())
+            os._exit(0)
+        os.close(write_end)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_end) as pipe:
+            child_id = pipe.read()
+        
+        self.assertNotEqual(child_id, _new_id())
+
+
+if __name__ == "__main__":
+    unittest.main()